@@ -1,9 +1,18 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import ttk, messagebox
+import argparse
 import heapq
+import mmap
+import os
 import random
+import sys
+import time
+from array import array
+
+from SearchRunner import PROGRESS_INTERVAL, SearchCancelled, SearchWorker, run_batch
 
 goal_state = "123456780"  # '0' is blank tile
+POLL_MS = 50
 
 def get_neighbors(state):
     neighbors = []
@@ -27,16 +36,23 @@ def heuristic(state):
         dist += abs(i // 3 - val // 3) + abs(i % 3 - val % 3)
     return dist
 
-def is_solvable(state):
+def is_solvable(state, width=3):
+    tiles = [int(c) for c in state]
+    blank_row = tiles.index(0) // width
+    tiles = [t for t in tiles if t != 0]
     inv = 0
-    tiles = [c for c in state if c != '0']
     for i in range(len(tiles)):
         for j in range(i + 1, len(tiles)):
             if tiles[i] > tiles[j]:
                 inv += 1
-    return inv % 2 == 0
+    if width % 2:
+        return inv % 2 == 0
+    # On even widths a vertical move jumps a tile over an odd number of others,
+    # so the blank's row (counted from the bottom) joins the parity invariant.
+    return (inv + width - blank_row) % 2 == 1
 
-def astar(start):
+def astar_reference(start):
+    # Original string-state search, kept as the baseline for benchmark().
     heap = [(heuristic(start), 0, start, [])]
     visited = set()
     while heap:
@@ -49,14 +65,594 @@ def astar(start):
                 heapq.heappush(heap, (cost + 1 + heuristic(neighbor), cost + 1, neighbor, path + [current]))
     return None
 
+# --- Packed-integer A* ---
+# A board is packed into an int with 4 bits per cell (cell i at bits 4*i), so
+# states hash cheaply and sliding a tile is a single multiply-add. The blank is
+# tracked alongside the packed board, and each move carries its precomputed
+# Manhattan delta so the heuristic is updated instead of recomputed.
+
+def pack(state):
+    packed = 0
+    for i, c in enumerate(state):
+        packed |= int(c) << (4 * i)
+    return packed
+
+def unpack(packed, size=9):
+    return "".join(str((packed >> (4 * i)) & 15) for i in range(size))
+
+GOAL = pack(goal_state)
+
+# MANHATTAN[tile][cell]: distance of `tile` at `cell` from its goal cell.
+MANHATTAN = [[0] * 9 for _ in range(9)]
+for _tile in range(1, 9):
+    _home = goal_state.index(str(_tile))
+    for _cell in range(9):
+        MANHATTAN[_tile][_cell] = abs(_cell // 3 - _home // 3) + abs(_cell % 3 - _home % 3)
+
+# MOVES[blank]: (cell, shift, step, h_delta) for every tile that can slide into
+# the blank. `step` turns "tile at cell" into "tile at blank" when multiplied
+# by the tile value, and h_delta[tile] is the resulting heuristic change.
+MOVES = []
+for _zero in range(9):
+    _moves = []
+    for _cell in range(9):
+        if abs(_cell // 3 - _zero // 3) + abs(_cell % 3 - _zero % 3) == 1:
+            _moves.append((_cell, 4 * _cell, (1 << 4 * _zero) - (1 << 4 * _cell),
+                           tuple(MANHATTAN[t][_zero] - MANHATTAN[t][_cell] for t in range(9))))
+    MOVES.append(tuple(_moves))
+
+def astar_search(start, progress=None):
+    """Returns (path, nodes_expanded); path is None if the board is unsolvable.
+
+    progress(nodes_expanded, frontier_size) is called every PROGRESS_INTERVAL
+    expansions and may raise SearchCancelled to abort.
+    """
+    if not is_solvable(start):
+        return None, 0
+    packed = pack(start)
+    h = heuristic(start)
+    best_g = {packed: 0}
+    parent = {packed: None}
+    heap = [(h, h, packed, start.index('0'))]
+    expanded = 0
+
+    while heap:
+        f, h, current, zero = heapq.heappop(heap)
+        g = f - h
+        if g > best_g[current]:
+            continue  # stale entry, a cheaper route was pushed later
+        if current == GOAL:
+            break
+        expanded += 1
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, len(heap))
+        g += 1
+        for cell, shift, step, h_delta in MOVES[zero]:
+            tile = (current >> shift) & 15
+            neighbor = current + tile * step
+            if g < best_g.get(neighbor, g + 1):
+                best_g[neighbor] = g
+                parent[neighbor] = current
+                nh = h + h_delta[tile]
+                heapq.heappush(heap, (g + nh, nh, neighbor, cell))
+    else:
+        return None, expanded
+
+    path = []
+    while current is not None:
+        path.append(unpack(current))
+        current = parent[current]
+    return path[::-1], expanded
+
+def astar(start):
+    return astar_search(start)[0]
+
+# --- Breadth-first and bidirectional search ---
+# Both reuse the packed boards and MOVES tables. bfs_search is a plain
+# layer-by-layer BFS, kept as a baseline. bidirectional_search is DIBBS
+# (dynamically improved bounds bidirectional search): an A* from the board
+# guided by Manhattan distance to the goal, and one from the goal guided by
+# Manhattan distance to the board. A node reached with cost g is keyed
+# 2g + (distance ahead) - (distance behind); half the sum of the two sides'
+# smallest keys is a lower bound on any path not yet found, so the search
+# stops once the best meeting so far is no longer than that.
+
+def rebuild_path(meeting, forward, backward):
+    path = []
+    state = meeting
+    while state is not None:
+        path.append(unpack(state))
+        state = forward[state]
+    path.reverse()
+    state = backward[meeting]
+    while state is not None:
+        path.append(unpack(state))
+        state = backward[state]
+    return path
+
+def expand_layer(frontier, parents, other):
+    """Returns (next_frontier, meeting state or None, nodes expanded)."""
+    next_frontier = []
+    expanded = 0
+    for state, zero in frontier:
+        expanded += 1
+        for cell, shift, step, _ in MOVES[zero]:
+            neighbor = state + ((state >> shift) & 15) * step
+            if neighbor not in parents:
+                parents[neighbor] = state
+                if neighbor in other:
+                    return next_frontier, neighbor, expanded
+                next_frontier.append((neighbor, cell))
+    return next_frontier, None, expanded
+
+def bfs_search(start, progress=None):
+    """Like astar_search, but progress is reported once per BFS layer."""
+    if not is_solvable(start):
+        return None, 0
+    packed = pack(start)
+    parents = {packed: None}
+    frontier = [(packed, start.index('0'))]
+    goal = {GOAL: None}
+    meeting = packed if packed == GOAL else None
+    expanded = 0
+    while meeting is None:
+        frontier, meeting, count = expand_layer(frontier, parents, goal)
+        expanded += count
+        if progress is not None:
+            progress(expanded, len(frontier))
+    return rebuild_path(meeting, parents, goal), expanded
+
+def start_manhattan(start):
+    # Like MANHATTAN, but measured to each tile's cell in `start`.
+    table = [[0] * 9 for _ in range(9)]
+    for tile in range(1, 9):
+        home = start.index(str(tile))
+        for cell in range(9):
+            table[tile][cell] = abs(cell // 3 - home // 3) + abs(cell % 3 - home % 3)
+    return table
+
+def bidirectional_search(start, progress=None):
+    """Like astar_search; the frontier size counts both directions."""
+    if not is_solvable(start):
+        return None, 0
+    packed = pack(start)
+    if packed == GOAL:
+        return [start], 0
+    to_start = start_manhattan(start)
+    # Each side: (best g, parents, heap, table ahead, table behind). Heap
+    # entries are (key, -g, state, blank, distance ahead, distance behind);
+    # -g breaks ties towards deeper nodes.
+    h = heuristic(start)
+    forward = ({packed: 0}, {packed: None}, [(h, 0, packed, start.index('0'), h, 0)], MANHATTAN, to_start)
+    h = sum(to_start[(GOAL >> 4 * cell) & 15][cell] for cell in range(9))
+    backward = ({GOAL: 0}, {GOAL: None}, [(h, 0, GOAL, goal_state.index('0'), h, 0)], to_start, MANHATTAN)
+    best, meeting = float('inf'), None
+    expanded = 0
+
+    while True:
+        keys = []
+        for best_g, _, heap, _, _ in (forward, backward):
+            while heap and -heap[0][1] > best_g[heap[0][2]]:
+                heapq.heappop(heap)  # stale entry, a cheaper route was pushed later
+            keys.append(heap[0][0] if heap else float('inf'))
+        if best <= (keys[0] + keys[1]) / 2:
+            break
+        side, other = (forward, backward) if keys[0] <= keys[1] else (backward, forward)
+        best_g, parent, heap, ahead, behind = side
+        _, negative_g, current, zero, h_ahead, h_behind = heapq.heappop(heap)
+        expanded += 1
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, len(forward[2]) + len(backward[2]))
+        g = 1 - negative_g
+        for cell, shift, step, _ in MOVES[zero]:
+            tile = (current >> shift) & 15
+            neighbor = current + tile * step
+            if g < best_g.get(neighbor, g + 1):
+                best_g[neighbor] = g
+                parent[neighbor] = current
+                na = h_ahead + ahead[tile][zero] - ahead[tile][cell]
+                nb = h_behind + behind[tile][zero] - behind[tile][cell]
+                heapq.heappush(heap, (2 * g + na - nb, -g, neighbor, cell, na, nb))
+                other_g = other[0].get(neighbor)
+                if other_g is not None and g + other_g < best:
+                    best, meeting = g + other_g, neighbor
+    return rebuild_path(meeting, forward[1], backward[1]), expanded
+
+SOLVERS = {"astar": astar_search, "bidirectional": bidirectional_search, "bfs": bfs_search}
+
+def solve(board, mode="astar", progress=None):
+    """Headless entry point: returns (path, nodes_expanded) using one of SOLVERS."""
+    return SOLVERS[mode](board, progress)
+
+# --- Distance table ---
+# The 8-puzzle has only 181,440 solvable boards, so a reverse BFS from the goal
+# can record the exact distance of every one of them. Boards are indexed by
+# their permutation rank (Lehmer code) into a 9!-byte table; unsolvable ranks
+# stay at UNREACHABLE. Solving is then a downhill walk over the table.
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "8puzzle_distances.bin")
+UNREACHABLE = 255
+FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040, 40320, 362880]
+
+def permutation_rank(state):
+    # Digits to the right that are smaller than d = d minus the smaller
+    # digits already seen on the left.
+    rank = 0
+    seen = 0
+    for i, c in enumerate(state):
+        d = int(c)
+        rank += (d - (seen & ((1 << d) - 1)).bit_count()) * FACTORIALS[8 - i]
+        seen |= 1 << d
+    return rank
+
+def build_distance_table():
+    table = bytearray([UNREACHABLE]) * FACTORIALS[9]
+    table[permutation_rank(goal_state)] = 0
+    frontier = [goal_state]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            for neighbor in get_neighbors(state):
+                rank = permutation_rank(neighbor)
+                if table[rank] == UNREACHABLE:
+                    table[rank] = depth
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return table
+
+def save_distance_table(table, path=TABLE_PATH):
+    with open(path, "wb") as f:
+        f.write(table)
+
+def load_distance_table(path=TABLE_PATH):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def solve_with_table(start, table):
+    dist = table[permutation_rank(start)]
+    if dist == UNREACHABLE:
+        return None
+    path = [start]
+    while dist:
+        for neighbor in get_neighbors(path[-1]):
+            if table[permutation_rank(neighbor)] == dist - 1:
+                path.append(neighbor)
+                break
+        dist -= 1
+    return path
+
+# --- N-puzzle: IDA* with additive pattern databases ---
+# Boards are sequences of ints in row-major order with 0 for the blank, solved
+# when they read 1..n-1 followed by the blank. IDA* only keeps the current path
+# in memory. Its heuristic adds up disjoint pattern databases: each one stores,
+# for every placement of its tiles, the fewest moves *of those tiles* needed to
+# bring them home, so the sum over disjoint groups never overestimates.
+#
+# A database over k tiles is indexed by the rank of their placement as a
+# k-permutation of the cells: tile i contributes its cell's position among the
+# cells left free by tiles 0..i-1, times the number of ways to place the tiles
+# after it. That packs a table into cells!/(cells-k)! bytes (5.8 MB for six
+# tiles of the 15-puzzle) instead of cells**k, and a move still updates the
+# index from the old one. The default groups are the largest whose tables stay
+# under PDB_TABLE_BYTES (4-4-4-4-4-4 on the 24-puzzle); the 15-puzzle uses a
+# 6-6-3 split into two 2x3 blocks and the bottom row, which scored better than
+# consecutive tile numbers.
+
+PDB_DIR = os.path.dirname(os.path.abspath(__file__))
+PDB_TABLE_BYTES = 6_000_000
+PDB_GROUPS = {4: [(1, 2, 5, 6, 9, 10), (3, 4, 7, 8, 11, 12), (13, 14, 15)]}
+FOUND = -1
+
+def goal_board(width):
+    return tuple(range(1, width * width)) + (0,)
+
+def board_neighbors(width):
+    neighbors = []
+    for cell in range(width * width):
+        row, col = divmod(cell, width)
+        adjacent = []
+        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < width and 0 <= nc < width:
+                adjacent.append(nr * width + nc)
+        neighbors.append(tuple(adjacent))
+    return neighbors
+
+def placement_weights(cells, k):
+    """Weight of each tile's digit in a placement rank; weights[0] * cells is the table size."""
+    weights = [1] * k
+    for i in range(k - 2, -1, -1):
+        weights[i] = weights[i + 1] * (cells - 1 - i)
+    return weights
+
+def placement_rank(positions, weights):
+    rank = 0
+    for i, cell in enumerate(positions):
+        rank += (cell - sum(1 for earlier in positions[:i] if earlier < cell)) * weights[i]
+    return rank
+
+def rank_delta(positions, i, old, new, weights):
+    # Change in rank when tile i moves from `old` to `new`. Only tiles on cells
+    # strictly between the two see their digits change, so sideways moves
+    # are a single multiply.
+    delta = (new - old) * weights[i]
+    if abs(new - old) > 1:
+        step = 1 if new > old else -1
+        low, high = min(old, new), max(old, new)
+        for j, cell in enumerate(positions):
+            if low < cell < high:
+                delta += step * weights[j] if j > i else -step * weights[i]
+    return delta
+
+def default_groups(width):
+    if width in PDB_GROUPS:
+        return PDB_GROUPS[width]
+    cells = width * width
+    size = 1
+    while size < cells - 1 and placement_weights(cells, size + 1)[0] * cells <= PDB_TABLE_BYTES:
+        size += 1
+    tiles = list(range(1, cells))
+    return [tuple(tiles[i:i + size]) for i in range(0, len(tiles), size)]
+
+def build_pattern_database(width, tiles):
+    # BFS over (placement, blank region): sliding a pattern tile costs 1,
+    # sliding any other tile costs 0, so a state is a placement plus the set of
+    # cells the blank can reach for free. A move slides a pattern tile next to
+    # the region into it. Queues hold placements packed as sum(cell * cells**i)
+    # next to their ranks; `seen` has one bit per (rank, blank cell), and
+    # visiting a state marks its whole region.
+    cells, k = width * width, len(tiles)
+    weights = placement_weights(cells, k)
+    neighbor_masks = [sum(1 << n for n in adjacent) for adjacent in board_neighbors(width)]
+    powers = [cells ** i for i in range(k)]
+    goal = goal_board(width)
+    table = bytearray([UNREACHABLE]) * (weights[0] * cells)
+    seen = bytearray((len(table) * cells + 7) // 8)
+    start = [goal.index(t) for t in tiles]
+    layer = array("q", [sum(cell * power for cell, power in zip(start, powers)) * cells + goal.index(0)])
+    ranks = array("q", [placement_rank(start, weights)])
+    cost = 0
+    while layer:
+        next_layer, next_ranks = array("q"), array("q")
+        for state, rank in zip(layer, ranks):
+            packed, blank = divmod(state, cells)
+            key = rank * cells + blank
+            if seen[key >> 3] >> (key & 7) & 1:
+                continue
+            positions = []
+            rest = packed
+            for _ in tiles:
+                rest, cell = divmod(rest, cells)
+                positions.append(cell)
+            occupied = 0
+            for cell in positions:
+                occupied |= 1 << cell
+            region = 1 << blank
+            frontier = region
+            while frontier:
+                cell = frontier.bit_length() - 1
+                frontier ^= 1 << cell
+                grow = neighbor_masks[cell] & ~occupied & ~region
+                region |= grow
+                frontier |= grow
+            rest = region
+            while rest:
+                cell = rest.bit_length() - 1
+                rest ^= 1 << cell
+                key = rank * cells + cell
+                seen[key >> 3] |= 1 << (key & 7)
+            if table[rank] == UNREACHABLE:
+                table[rank] = cost
+            for i, cell in enumerate(positions):
+                reachable = neighbor_masks[cell] & region
+                while reachable:
+                    target = reachable.bit_length() - 1
+                    reachable ^= 1 << target
+                    moved = rank + rank_delta(positions, i, cell, target, weights)
+                    key = moved * cells + cell
+                    if not seen[key >> 3] >> (key & 7) & 1:
+                        next_layer.append((packed + (target - cell) * powers[i]) * cells + cell)
+                        next_ranks.append(moved)
+        layer, ranks = next_layer, next_ranks
+        cost += 1
+    return table
+
+def load_pattern_database(width, tiles, directory=PDB_DIR):
+    # Files of the wrong size (e.g. written with the old cells**k index) are rebuilt.
+    path = os.path.join(directory, f"{width}x{width}-{'-'.join(map(str, tiles))}.pdb")
+    size = placement_weights(width * width, len(tiles))[0] * width * width
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        with open(path, "wb") as f:
+            f.write(build_pattern_database(width, tiles))
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class NPuzzleSolver:
+    def __init__(self, width, groups=None, directory=PDB_DIR):
+        self.width = width
+        self.cells = width * width
+        self.groups = [tuple(g) for g in groups or default_groups(width)]
+        self.tables = [load_pattern_database(width, g, directory) for g in self.groups]
+        self.weights = [placement_weights(self.cells, len(g)) for g in self.groups]
+        self.neighbors = board_neighbors(width)
+        # tile_group[tile] = (group number, position of the tile in that group)
+        self.tile_group = [None] * self.cells
+        for number, tiles in enumerate(self.groups):
+            for i, tile in enumerate(tiles):
+                self.tile_group[tile] = (number, i)
+
+    def group_positions(self, board):
+        positions = [[0] * len(tiles) for tiles in self.groups]
+        for cell, tile in enumerate(board):
+            if tile and self.tile_group[tile]:
+                number, i = self.tile_group[tile]
+                positions[number][i] = cell
+        return positions
+
+    def heuristic(self, board):
+        return sum(table[placement_rank(cells, weights)]
+                   for table, cells, weights in zip(self.tables, self.group_positions(board), self.weights))
+
+    def solve(self, start):
+        """Returns (path, nodes_expanded); path is None if the board is unsolvable."""
+        board = [int(t) for t in start]
+        if not is_solvable(board, self.width):
+            return None, 0
+        indexes = [placement_rank(cells, weights) for cells, weights in zip(self.group_positions(board), self.weights)]
+        tables, neighbors = self.tables, self.neighbors
+        # Per tile: its group number (-1 for none), its order in the group and
+        # its weight. A vertical move passes over the cells in between, and
+        # same-group tiles there shift a digit by one (see rank_delta).
+        tile_number, tile_order, tile_weight = [-1] * self.cells, [0] * self.cells, [0] * self.cells
+        for tile, group in enumerate(self.tile_group):
+            if group:
+                tile_number[tile], tile_order[tile] = group
+                tile_weight[tile] = self.weights[group[0]][group[1]]
+        between = [[tuple(range(min(a, b) + 1, max(a, b))) for b in range(self.cells)] for a in range(self.cells)]
+        goal = list(goal_board(self.width))
+        moves = []
+        expanded = 0
+
+        def search(blank, previous, g, h, bound):
+            nonlocal expanded
+            f = g + h
+            if f > bound:
+                return f
+            if h == 0 and board == goal:
+                return FOUND
+            expanded += 1
+            minimum = float('inf')
+            for cell in neighbors[blank]:
+                if cell == previous:
+                    continue
+                tile = board[cell]
+                board[blank], board[cell] = tile, 0
+                number = tile_number[tile]
+                if number >= 0:
+                    old = indexes[number]
+                    weight = tile_weight[tile]
+                    new = old + (blank - cell) * weight
+                    for passed in between[cell][blank]:
+                        other = board[passed]
+                        if tile_number[other] == number:
+                            shift = tile_weight[other] if tile_order[other] > tile_order[tile] else -weight
+                            new += shift if blank > cell else -shift
+                    indexes[number] = new
+                    nh = h - tables[number][old] + tables[number][new]
+                else:
+                    nh = h
+                moves.append(cell)
+                t = search(cell, blank, g + 1, nh, bound)
+                if t == FOUND:
+                    return FOUND
+                moves.pop()
+                if number >= 0:
+                    indexes[number] = old
+                board[cell], board[blank] = tile, 0
+                if t < minimum:
+                    minimum = t
+            return minimum
+
+        blank = board.index(0)
+        h = sum(table[i] for table, i in zip(tables, indexes))
+        bound = h
+        start_board = list(board)
+        while True:
+            t = search(blank, -1, 0, h, bound)
+            if t == FOUND:
+                break
+            bound = t
+
+        path = [tuple(start_board)]
+        board = start_board
+        for cell in moves:
+            board[blank], board[cell] = board[cell], 0
+            blank = cell
+            path.append(tuple(board))
+        return path, expanded
+
+def random_n_board(width, rng=random):
+    board = list(goal_board(width))
+    rng.shuffle(board)
+    while not is_solvable(board, width):
+        rng.shuffle(board)
+    return board
+
+# --- Benchmark ---
+
+HARD_BOARDS = ["867254301", "647850321"]  # the two 31-move boards
+
+def random_board(rng=random):
+    board = "".join(rng.sample("123456780", 9))
+    while not is_solvable(board):
+        board = "".join(rng.sample("123456780", 9))
+    return board
+
+def benchmark(count=20, seed=0):
+    rng = random.Random(seed)
+    boards = HARD_BOARDS + [random_board(rng) for _ in range(count)]
+    totals = {}
+    for name, solver in (("reference", astar_reference), ("packed", astar)):
+        start_time = time.perf_counter()
+        for board in boards:
+            solver(board)
+        totals[name] = time.perf_counter() - start_time
+        print(f"{name:>9}: {len(boards)} boards in {totals[name]:.3f}s "
+              f"({1000 * totals[name] / len(boards):.2f}ms/board)")
+    print(f"  speedup: {totals['reference'] / totals['packed']:.1f}x")
+
+def compare_modes(count=100, seed=0, deep=26):
+    # Fixed corpus: the hardest boards plus seeded random ones. The last
+    # column averages over boards needing at least `deep` moves.
+    rng = random.Random(seed)
+    boards = HARD_BOARDS + [random_board(rng) for _ in range(count)]
+    for mode, solver in SOLVERS.items():
+        nodes = deep_nodes = deep_boards = 0
+        start_time = time.perf_counter()
+        for board in boards:
+            path, expanded = solver(board)
+            nodes += expanded
+            if len(path) - 1 >= deep:
+                deep_nodes += expanded
+                deep_boards += 1
+        elapsed = time.perf_counter() - start_time
+        print(f"{mode:>13}: {nodes / len(boards):9.1f} nodes/board, "
+              f"{deep_nodes / max(deep_boards, 1):9.1f} on {deep}+ moves, "
+              f"{1000 * elapsed / len(boards):.2f}ms/board")
+
+# --- Batch solving ---
+# The chunked process-pool loop lives in SearchRunner.run_batch.
+
+def solve_chunk(boards, mode="astar"):
+    """Solves a list of (line number, board) pairs; returns their result dicts."""
+    results = []
+    for number, board in boards:
+        result = {"line": number, "board": board}
+        if len(board) != 9 or sorted(board) != sorted(goal_state):
+            result["error"] = "invalid board"
+        else:
+            start_time = time.perf_counter()
+            path, expanded = solve(board, mode)
+            result["length"] = len(path) - 1 if path else None
+            result["nodes"] = expanded
+            result["time_ms"] = round(1000 * (time.perf_counter() - start_time), 3)
+        results.append(result)
+    return results
+
+def solve_batch(lines, out, workers=None, chunk_size=256, mode="astar"):
+    run_batch(solve_chunk, lines, out, workers, chunk_size, mode)
+
 class PuzzleGUI:
     def __init__(self, root):
         self.root = root
-        self.root.title("8 Puzzle Solver (A*)")
+        self.root.title("8 Puzzle Solver")
         self.tiles = []
-        self.board = "".join(random.sample("123456780", 9))
-        while not is_solvable(self.board):
-            self.board = "".join(random.sample("123456780", 9))
+        self.board = random_board()
+        self.table = load_distance_table() if os.path.exists(TABLE_PATH) else None
+        self.mode = tk.StringVar(value="table" if self.table is not None else "astar")
+        self.search = SearchWorker()
         self.create_ui()
         self.draw_board(self.board)
 
@@ -71,8 +667,17 @@ class PuzzleGUI:
                 row.append(b)
             self.tiles.append(row)
 
-        solve_btn = tk.Button(self.root, text="Solve with A*", command=self.solve)
-        solve_btn.pack(pady=10)
+        controls = tk.Frame(self.root)
+        controls.pack(pady=10)
+        modes = list(SOLVERS) + (["table"] if self.table is not None else [])
+        ttk.Combobox(controls, textvariable=self.mode, values=modes, width=13, state="readonly").pack(side=tk.LEFT, padx=5)
+        self.solve_btn = tk.Button(controls, text="Solve", command=self.solve)
+        self.solve_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = tk.Button(controls, text="Cancel", command=self.search.cancel, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+
+        self.status = tk.Label(self.root, text="")
+        self.status.pack(pady=5)
 
     def draw_board(self, state):
         for i in range(3):
@@ -81,11 +686,41 @@ class PuzzleGUI:
                 self.tiles[i][j].config(text='' if val == '0' else val)
 
     def solve(self):
-        solution = astar(self.board)
+        if self.search.busy:
+            return
+        self.search.start(self.run_search, self.mode.get(), self.board)
+        self.solve_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.root.after(POLL_MS, self.poll)
+
+    def run_search(self, progress, mode, board):
+        if mode == "table":
+            return mode, solve_with_table(board, self.table), 0
+        return (mode, *solve(board, mode, progress))
+
+    def poll(self):
+        if self.search.running:
+            nodes, frontier = self.search.progress
+            self.status.config(text=f"Searching... Nodes={nodes}, Frontier={frontier}")
+            self.root.after(POLL_MS, self.poll)
+            return
+        self.solve_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        try:
+            mode, solution, expanded = self.search.collect()
+        except SearchCancelled:
+            self.status.config(text="Search cancelled.")
+            return
+        except Exception as error:
+            self.status.config(text=f"Search failed: {error!r}")
+            return
         if not solution:
+            self.status.config(text="")
             messagebox.showerror("Unsolvable", "This puzzle can't be solved.")
-            return
-        self.animate(solution)
+        else:
+            self.status.config(text=f"{mode}: {len(solution) - 1} moves, Nodes={expanded}, "
+                                    f"Time={1000 * self.search.elapsed:.2f}ms")
+            self.animate(solution)
 
     def animate(self, steps):
         def step(i):
@@ -96,6 +731,41 @@ class PuzzleGUI:
 
 # Start GUI
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="8-Puzzle solver (opens the GUI when run without options)")
+    parser.add_argument("--bench", action="store_true", help="compare astar against astar_reference")
+    parser.add_argument("--build-table", action="store_true", help="write the full distance table")
+    parser.add_argument("--npuzzle", type=int, metavar="WIDTH", help="solve a random WIDTHxWIDTH board with IDA*")
+    parser.add_argument("--batch", metavar="FILE", help="solve one board per line from FILE ('-' for stdin) and print JSON lines")
+    parser.add_argument("--workers", type=int, help="worker processes for --batch (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="boards per task for --batch")
+    parser.add_argument("--mode", choices=list(SOLVERS), default="astar", help="search used by --batch")
+    parser.add_argument("--compare", action="store_true", help="compare node counts of every search mode")
+    args = parser.parse_args()
+    if args.batch:
+        if args.batch == "-":
+            solve_batch(sys.stdin, sys.stdout, args.workers, args.chunk_size, args.mode)
+        else:
+            with open(args.batch) as f:
+                solve_batch(f, sys.stdout, args.workers, args.chunk_size, args.mode)
+        sys.exit()
+    if args.bench:
+        benchmark()
+        sys.exit()
+    if args.compare:
+        compare_modes()
+        sys.exit()
+    if args.build_table:
+        save_distance_table(build_distance_table())
+        print(f"Wrote {TABLE_PATH}")
+        sys.exit()
+    if args.npuzzle:
+        solver = NPuzzleSolver(args.npuzzle)
+        board = random_n_board(args.npuzzle)
+        print("Board:", " ".join(map(str, board)))
+        start_time = time.perf_counter()
+        path, expanded = solver.solve(board)
+        print(f"Solved in {len(path) - 1} moves, {expanded} nodes, {time.perf_counter() - start_time:.2f}s")
+        sys.exit()
     root = tk.Tk()
     app = PuzzleGUI(root)
     root.mainloop()
@@ -1,6 +1,16 @@
+import argparse
 import heapq
+import random
+import sys
+import time
+import tracemalloc
+
+from GridSearch import DistanceField, DStarLite, Grid, HierarchicalPathfinder, PathCache
+from GridSearch import ara_star as grid_ara_star, astar as grid_astar, jps as grid_jps, weighted_astar as grid_weighted_astar
 
 class Node:
+    __slots__ = ("position", "parent", "g", "h", "f")
+
     def __init__(self, position, parent=None):
         self.position = position
         self.parent = parent
@@ -14,7 +24,9 @@ class Node:
 def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def astar(grid, start, end):
+def astar_reference(grid, start, end):
+    # Original search: scans the whole open list for every neighbor. Kept as
+    # the baseline for benchmark().
     open_list = []
     closed_set = set()
     start_node = Node(start)
@@ -52,29 +64,340 @@ def astar(grid, start, end):
 
     return None
 
-# Manual input
-rows = int(input("Enter number of rows: "))
-cols = int(input("Enter number of columns: "))
-
-grid = []
-print("Enter the grid row by row (0 = free, 1 = wall):")
-for i in range(rows):
-    row = list(map(int, input(f"Row {i}: ").split()))
-    if len(row) != cols:
-        raise ValueError("Row length must match number of columns")
-    grid.append(row)
-
-start = tuple(map(int, input("Enter start position (row col): ").split()))
-goal = tuple(map(int, input("Enter goal position (row col): ").split()))
-
-path = astar(grid, start, goal)
-
-if path:
-    print("Shortest Path Found:")
-    for step in path:
-        print(step)
-else:
-    print("No path found")
+def astar(grid, start, end):
+    # Nested lists are packed into a flat Grid first; a Grid (for example one
+    # memory-mapped with Grid.load) is searched as-is.
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    return grid_astar(grid, start, end)[0]
+
+def jps(grid, start, end):
+    # Jump Point Search: same path cost as astar, far fewer expansions on open maps.
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    return grid_jps(grid, start, end)[0]
+
+def weighted_astar(grid, start, end, weight=1.5):
+    # Path cost at most weight times the optimum, usually with far fewer expansions.
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    return grid_weighted_astar(grid, start, end, weight)[0]
+
+def ara_star(grid, start, end, time_budget=0.05):
+    # Anytime search: the best path found within time_budget seconds, and its
+    # suboptimality bound (1.0 means optimal, inf means no path yet).
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    path, bound, _ = grid_ara_star(grid, start, end, time_budget)
+    return path, bound
+
+ENGINES = {"astar": astar, "jps": jps, "weighted": weighted_astar}
+
+# Benchmark: random grids, start and goal in opposite corners.
+def random_grid(size, density=0.2, seed=0):
+    rng = random.Random(seed)
+    grid = [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = 0
+    return grid
+
+def maze_grid(size, seed=0):
+    # Recursive-backtracker maze: cells at odd coordinates, corridors one wide.
+    rng = random.Random(seed)
+    grid = [[1] * size for _ in range(size)]
+    grid[1][1] = 0
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        options = [(dr, dc) for dr, dc in [(-2, 0), (2, 0), (0, -2), (0, 2)]
+                   if 0 < r + dr < size - 1 and 0 < c + dc < size - 1 and grid[r + dr][c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(options)
+        grid[r + dr // 2][c + dc // 2] = grid[r + dr][c + dc] = 0
+        stack.append((r + dr, c + dc))
+    return grid
+
+def benchmark(sizes=(100, 300, 1000), density=0.2, reference_limit=300):
+    for size in sizes:
+        grid = random_grid(size, density)
+        start, end = (0, 0), (size - 1, size - 1)
+        for name, solver in (("reference", astar_reference), ("indexed", astar)):
+            if name == "reference" and size > reference_limit:
+                print(f"{size}x{size} {name:>9}: skipped (quadratic open-list scan)")
+                continue
+            start_time = time.perf_counter()
+            path = solver(grid, start, end)
+            elapsed = time.perf_counter() - start_time
+            tracemalloc.start()
+            solver(grid, start, end)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            length = len(path) if path else "none"
+            print(f"{size}x{size} {name:>9}: path={length}, time={elapsed:.3f}s, peak={peak / 2**20:.1f}MiB")
+
+def benchmark_engines(size=1000):
+    # Nodes expanded and wall time of A* and JPS on open-field and maze maps.
+    maps = [("open-field", random_grid(size, 0.05)), ("maze", maze_grid(size - 1 + size % 2))]
+    for name, rows in maps:
+        grid = Grid.from_rows(rows)
+        start, end = (1, 1), (grid.rows - 2, grid.cols - 2)
+        for engine, search in (("astar", grid_astar), ("jps", grid_jps)):
+            start_time = time.perf_counter()
+            path, expanded = search(grid, start, end)
+            elapsed = time.perf_counter() - start_time
+            length = len(path) if path else "none"
+            print(f"{name:>10} {engine:>5}: path={length}, nodes={expanded}, time={elapsed:.3f}s")
+
+def benchmark_hpa(size=1001, queries=20, cluster_sizes=(16, 32)):
+    # Per-query latency of HPA* against plain A* on one map, plus path quality.
+    grid = Grid.from_rows(maze_grid(size))
+    rng = random.Random(0)
+    pairs = []
+    while len(pairs) < queries:
+        start = (rng.randrange(grid.rows), rng.randrange(grid.cols))
+        end = (rng.randrange(grid.rows), rng.randrange(grid.cols))
+        if grid.is_free(*start) and grid.is_free(*end):
+            pairs.append((start, end))
+    start_time = time.perf_counter()
+    optimal = [len(grid_astar(grid, start, end)[0]) for start, end in pairs]
+    elapsed = time.perf_counter() - start_time
+    print(f"astar: {1000 * elapsed / queries:.1f}ms/query")
+    for cluster_size in cluster_sizes:
+        start_time = time.perf_counter()
+        finder = HierarchicalPathfinder(grid, cluster_size)
+        build = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        lengths = [len(finder.find_path(start, end)[0]) for start, end in pairs]
+        elapsed = time.perf_counter() - start_time
+        worst = max(length / best for length, best in zip(lengths, optimal))
+        print(f"hpa* cluster={cluster_size}: build={build:.1f}s, {1000 * elapsed / queries:.1f}ms/query, "
+              f"worst path ratio={worst:.3f}")
+
+def benchmark_replan(size=300, edits=100, seed=0, density=0.25):
+    # Randomized edit stream: after each small batch of wall flips (half of
+    # them on the current path) the agent steps forward and replans.
+    rng = random.Random(seed)
+    grid = Grid.from_rows(random_grid(size, density, seed))
+    start, end = (0, 0), (size - 1, size - 1)
+    planner = DStarLite(grid)
+    start_time = time.perf_counter()
+    path, expanded = planner.plan(start, end)
+    print(f"initial plan: {1000 * (time.perf_counter() - start_time):.1f}ms, nodes={expanded}"
+          + ("" if path else ", no path"))
+    replan_time = astar_time = replan_nodes = astar_nodes = done = 0
+    while done < edits and path and len(path) > 2:
+        changes = []
+        for _ in range(rng.randint(1, 3)):
+            cell = rng.choice(path[2:]) if rng.random() < 0.5 else (rng.randrange(size), rng.randrange(size))
+            if cell != end:
+                changes.append((cell, rng.random() < 0.5))
+        planner.update_cells(changes)
+        start = path[1]
+        start_time = time.perf_counter()
+        path, expanded = planner.replan(start)
+        replan_time += time.perf_counter() - start_time
+        replan_nodes += expanded
+        start_time = time.perf_counter()
+        astar_nodes += grid_astar(grid, start, end)[1]
+        astar_time += time.perf_counter() - start_time
+        done += 1
+    print(f"{done} edits")
+    if done == 0:
+        print("no path to replan on; try another seed or a lower density")
+        return
+    print(f"D* Lite replan: {1000 * replan_time / done:.2f}ms, {replan_nodes / done:.1f} nodes per edit")
+    print(f"  A* from scratch: {1000 * astar_time / done:.2f}ms, {astar_nodes / done:.1f} nodes per edit")
+
+def benchmark_cache(size=1000, hot=50, queries=2000, seed=0):
+    # Skewed query stream over a hot set of start/goal pairs, with some
+    # queries between two points of an earlier path (subpath hits) and an
+    # occasional wall edit that invalidates everything.
+    rng = random.Random(seed)
+    grid = Grid.from_rows(random_grid(size, 0.2, seed))
+    cache = PathCache(grid, capacity=hot // 2)
+    cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(hot)]
+    pairs = [(a, b) for a, b in zip(cells, cells[1:]) if grid.is_free(*a) and grid.is_free(*b)]
+    timings = {"hit": [], "miss": []}
+    for n in range(queries):
+        start, end = pairs[min(int(rng.expovariate(0.2)), len(pairs) - 1)]
+        if rng.random() < 0.2:
+            path = cache.find_path(start, end)
+            if path and len(path) > 2:
+                i, j = sorted(rng.sample(range(len(path)), 2))
+                start, end = path[i], path[j]
+        if n % 500 == 499:
+            grid.set_wall(*rng.choice(cells), False)
+        before = cache.misses
+        start_time = time.perf_counter()
+        cache.find_path(start, end)
+        timings["miss" if cache.misses > before else "hit"].append(time.perf_counter() - start_time)
+    for kind, values in timings.items():
+        if values:
+            print(f"{kind:>4}: {len(values)} queries, mean {1e6 * sum(values) / len(values):.1f}us")
+    print(cache.stats())
+
+def check_cache(size=40, queries=5000, seed=0):
+    # Regression check: on a grid under constant wall edits (often on cached
+    # paths and query endpoints), every PathCache answer must match a fresh
+    # A*: same length, or None for both. Returns the number of mismatches.
+    rng = random.Random(seed)
+    grid = Grid.from_rows(random_grid(size, 0.25, seed))
+    cache = PathCache(grid, capacity=64)
+    recent = []
+    mismatches = 0
+    for _ in range(queries):
+        if recent and rng.random() < 0.5:
+            path = rng.choice(recent)
+            start, end = rng.choice(path), rng.choice(path)
+        else:
+            start = (rng.randrange(-1, size + 1), rng.randrange(-1, size + 1))
+            end = (rng.randrange(-1, size + 1), rng.randrange(-1, size + 1))
+        if rng.random() < 0.1:
+            r, c = rng.choice(recent[-1]) if recent and rng.random() < 0.5 else (rng.randrange(size), rng.randrange(size))
+            grid.set_wall(r, c, grid.is_free(r, c))
+        cached = cache.find_path(start, end)
+        fresh = grid_astar(grid, start, end)[0]
+        if (cached is None) != (fresh is None) or cached and (
+                len(cached) != len(fresh) or cached[0] != start or cached[-1] != end
+                or not all(grid.is_open(cell) for cell in cached)):
+            mismatches += 1
+            if mismatches == 1:
+                print(f"first mismatch: {start} -> {end}, cached={cached}, astar={fresh}")
+        if fresh and len(fresh) > 1:
+            recent = (recent + [fresh])[-20:]
+    print(f"{queries} queries, {mismatches} mismatches, {cache.stats()}")
+    return mismatches
+
+def benchmark_field(size=1001, queries=200, seed=0, path="bench.field"):
+    # One reverse BFS from the exits, then any-start queries by downhill walk,
+    # against a fresh A* per query.
+    rng = random.Random(seed)
+    grid = Grid.from_rows(maze_grid(size, seed))
+    exits = [(1, 1), (1, size - 2), (size - 2, 1), (size - 2, size - 2)]
+    start_time = time.perf_counter()
+    field = DistanceField.build(grid, exits)
+    print(f"build: {1000 * (time.perf_counter() - start_time):.1f}ms")
+    field.save(path)
+    start_time = time.perf_counter()
+    field = DistanceField.load(grid, path)
+    print(f"load (mmap): {1000 * (time.perf_counter() - start_time):.2f}ms")
+    starts = [(2 * rng.randrange(size // 2) + 1, 2 * rng.randrange(size // 2) + 1) for _ in range(queries)]
+    start_time = time.perf_counter()
+    for start in starts:
+        field.path_from(start)
+    print(f"nearest exit: {1000 * (time.perf_counter() - start_time) / queries:.2f}ms per query")
+    start_time = time.perf_counter()
+    for start in starts[:10]:
+        grid_astar(grid, start, exits[-1])
+    print(f"A* to one exit: {1000 * (time.perf_counter() - start_time) / 10:.2f}ms per query")
+
+def benchmark_anytime(size=1000, seed=0, budgets=(0.01, 0.05, 0.2, 1.0), weights=(1.0, 1.5, 2.0, 3.0)):
+    # Path quality against latency for weighted A* and time-budgeted ARA*.
+    grid = Grid.from_rows(random_grid(size, 0.25, seed))
+    start, end = (0, 0), (size - 1, size - 1)
+    for weight in weights:
+        start_time = time.perf_counter()
+        path, expanded = grid_weighted_astar(grid, start, end, weight)
+        elapsed = time.perf_counter() - start_time
+        print(f"weighted w={weight}: length={len(path) if path else 'none'}, nodes={expanded}, time={1000 * elapsed:.1f}ms")
+    for budget in budgets:
+        path, bound, expanded = grid_ara_star(grid, start, end, budget)
+        print(f"ara* budget={1000 * budget:.0f}ms: length={len(path) if path else 'none'}, bound={bound:.3f}, nodes={expanded}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid A* (prompts for the grid when no map file is given)")
+    parser.add_argument("map", nargs="?", help="PGM image, or raw byte file with rows and cols")
+    parser.add_argument("rows", nargs="?", type=int)
+    parser.add_argument("cols", nargs="?", type=int)
+    parser.add_argument("--engine", choices=list(ENGINES) + ["ara"], default="astar")
+    parser.add_argument("--weight", type=float, default=1.5, help="heuristic weight for --engine weighted")
+    parser.add_argument("--budget", type=float, default=0.05, help="seconds per query for --engine ara")
+    parser.add_argument("--bench", action="store_true", help="compare astar against astar_reference")
+    parser.add_argument("--bench-engines", action="store_true", help="compare astar and jps")
+    parser.add_argument("--bench-hpa", action="store_true", help="compare repeated-query latency of HPA* and astar")
+    parser.add_argument("--bench-replan", action="store_true", help="compare D* Lite replanning with astar on wall edits")
+    parser.add_argument("--bench-cache", action="store_true", help="measure path cache hit latency on a skewed query stream")
+    parser.add_argument("--check-cache", action="store_true", help="check cached answers against astar on an edited grid")
+    parser.add_argument("--bench-field", action="store_true", help="measure distance field build, load and query times")
+    parser.add_argument("--bench-anytime", action="store_true", help="compare weighted A* and time-budgeted ARA*")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark()
+        sys.exit()
+    if args.bench_engines:
+        benchmark_engines()
+        sys.exit()
+    if args.bench_hpa:
+        benchmark_hpa()
+        sys.exit()
+    if args.bench_replan:
+        benchmark_replan()
+        sys.exit()
+    if args.bench_cache:
+        benchmark_cache()
+        sys.exit()
+    if args.check_cache:
+        sys.exit(1 if check_cache() else 0)
+    if args.bench_field:
+        benchmark_field()
+        sys.exit()
+    if args.bench_anytime:
+        benchmark_anytime()
+        sys.exit()
+
+    if args.map:
+        grid = Grid.load(args.map, args.rows, args.cols)
+        print(f"Loaded {grid.rows}x{grid.cols} map")
+    else:
+        # Manual input
+        rows = int(input("Enter number of rows: "))
+        cols = int(input("Enter number of columns: "))
+
+        grid = []
+        print("Enter the grid row by row (0 = free, 1 = wall):")
+        for i in range(rows):
+            row = list(map(int, input(f"Row {i}: ").split()))
+            if len(row) != cols:
+                raise ValueError("Row length must match number of columns")
+            grid.append(row)
+
+    if not isinstance(grid, Grid):
+        grid = Grid.from_rows(grid)
+    # Repeated queries on the same map are answered from the cache when
+    # possible. Anytime results depend on the time budget, so ARA* bypasses it.
+    if args.engine == "ara":
+        cache = None
+    elif args.engine == "weighted":
+        cache = PathCache(grid, lambda grid, start, end: grid_weighted_astar(grid, start, end, args.weight),
+                          subpaths=False)
+    else:
+        cache = PathCache(grid, grid_jps if args.engine == "jps" else grid_astar)
+
+    while True:
+        text = input("Enter start position (row col), or press Enter to quit: ").strip()
+        if not text:
+            break
+        start = tuple(map(int, text.split()))
+        goal = tuple(map(int, input("Enter goal position (row col): ").split()))
+
+        start_time = time.perf_counter()
+        if cache is None:
+            path, bound, _ = grid_ara_star(grid, start, goal, args.budget)
+        else:
+            path = cache.find_path(start, goal)
+        elapsed = time.perf_counter() - start_time
+
+        if path:
+            print("Shortest Path Found:")
+            for step in path:
+                print(step)
+        else:
+            print("No path found")
+        if cache is None:
+            print(f"{1000 * elapsed:.3f}ms, suboptimality bound {bound:.3f}")
+        else:
+            print(f"{1000 * elapsed:.3f}ms, cache {cache.stats()}")
 
 
 """import heapq
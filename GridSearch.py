@@ -0,0 +1,1114 @@
+import heapq
+import math
+import mmap
+import pickle
+import random
+import struct
+import time
+import zlib
+from array import array
+from collections import OrderedDict, deque
+
+from SearchRunner import PROGRESS_INTERVAL
+
+try:
+    import numpy as np
+except ImportError:  # only bfs_wavefront needs it
+    np = None
+
+INF = math.inf
+
+class Grid:
+    """Row-major map of one byte per cell, indexed by r * cols + c.
+
+    A cell is passable when its byte equals `free` (0 for maps built in code
+    and raw files, the max gray value for PGM images where white is open).
+    `cells` can be a bytearray or a memory-mapped file, so large maps are
+    loaded without copying them into Python objects.
+    """
+
+    def __init__(self, rows, cols, cells, free=0):
+        if len(cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}")
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.cells = cells
+        self.free = free
+        self.version = 0  # bumped on every edit so caches can tell the map changed
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Packs a list of lists (0 = free, 1 = wall) into a Grid."""
+        cells = bytearray()
+        for row in rows:
+            if len(row) != len(rows[0]):
+                raise ValueError("Row length must match number of columns")
+            cells.extend(row)
+        return cls(len(rows), len(rows[0]), cells)
+
+    @classmethod
+    def load(cls, path, rows=None, cols=None):
+        """Memory-maps a binary PGM (P5) image, or a raw file of rows * cols bytes.
+
+        The mapping is copy-on-write, so edits stay in memory and never
+        touch the file.
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if data[:2] == b"P5":
+            width, height, maxval, offset = parse_pgm_header(data)
+            return cls(height, width, memoryview(data)[offset:offset + width * height], free=maxval)
+        if rows is None or cols is None:
+            raise ValueError("Raw maps need rows and cols")
+        return cls(rows, cols, memoryview(data)[:rows * cols])
+
+    def save(self, path):
+        """Writes the grid as a PGM image (white = free, black = wall)."""
+        with open(path, "wb") as f:
+            f.write(f"P5\n{self.cols} {self.rows}\n255\n".encode())
+            f.write(bytes(255 if cell == self.free else 0 for cell in self.cells))
+
+    def index(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def is_free(self, r, c):
+        return self.cells[r * self.cols + c] == self.free
+
+    def is_open(self, pos):
+        """True if pos is an in-bounds free cell. The engines answer (None, 0)
+        for any other start or goal instead of wrapping the flat index."""
+        return self.in_bounds(*pos) and self.is_free(*pos)
+
+    def set_wall(self, r, c, wall=True):
+        self.cells[r * self.cols + c] = (0 if self.free else 1) if wall else self.free
+        self.version += 1
+
+    def free_neighbors(self, index):
+        cells, free, cols = self.cells, self.free, self.cols
+        col = index % cols
+        result = []
+        if index >= cols and cells[index - cols] == free:
+            result.append(index - cols)
+        if index + cols < self.size and cells[index + cols] == free:
+            result.append(index + cols)
+        if col > 0 and cells[index - 1] == free:
+            result.append(index - 1)
+        if col < cols - 1 and cells[index + 1] == free:
+            result.append(index + 1)
+        return result
+
+def parse_pgm_header(data):
+    """Returns (width, height, maxval, pixel offset) of a binary PGM."""
+    fields = []
+    pos = 2
+    while len(fields) < 3:
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b"#":
+            while data[pos:pos + 1] not in (b"\n", b""):
+                pos += 1
+            continue
+        start = pos
+        while not data[pos:pos + 1].isspace():
+            pos += 1
+        fields.append(int(data[start:pos]))
+    width, height, maxval = fields
+    if maxval > 255:
+        raise ValueError("Only 8-bit PGM maps are supported")
+    return width, height, maxval, pos + 1
+
+# --- Maze generators ---
+# All generators are seeded and work on a flat bytearray, so multi-million
+# cell maps take seconds. Perfect mazes (backtracker, Kruskal) open the cells
+# at odd coordinates and the walls between them; maze_corners() gives the
+# first and last of those cells as a start/goal pair.
+
+def maze_corners(rows, cols):
+    return (1, 1), (rows - 2 if rows % 2 else rows - 3, cols - 2 if cols % 2 else cols - 3)
+
+def backtracker_maze(rows, cols, seed=0):
+    """Recursive-backtracker perfect maze: long, winding corridors."""
+    rng = random.Random(seed)
+    cells = bytearray([1]) * (rows * cols)
+    first = cols + 1
+    cells[first] = 0
+    stack = [first]
+    while stack:
+        current = stack[-1]
+        r, c = divmod(current, cols)
+        options = []
+        if r > 2:
+            options.append(-2 * cols)
+        if r + 2 < rows - 1:
+            options.append(2 * cols)
+        if c > 2:
+            options.append(-2)
+        if c + 2 < cols - 1:
+            options.append(2)
+        options = [step for step in options if cells[current + step]]
+        if not options:
+            stack.pop()
+            continue
+        step = rng.choice(options)
+        cells[current + step // 2] = cells[current + step] = 0
+        stack.append(current + step)
+    return Grid(rows, cols, cells)
+
+def kruskal_maze(rows, cols, seed=0):
+    """Randomized Kruskal perfect maze: many short dead ends."""
+    rng = random.Random(seed)
+    cells = bytearray([1]) * (rows * cols)
+    walls = []
+    for r in range(1, rows - 1, 2):
+        for c in range(1, cols - 1, 2):
+            index = r * cols + c
+            cells[index] = 0
+            if r + 2 < rows - 1:
+                walls.append((index, index + 2 * cols))
+            if c + 2 < cols - 1:
+                walls.append((index, index + 2))
+    rng.shuffle(walls)
+    parent = array("i", range(rows * cols))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in walls:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            cells[(a + b) // 2] = 0
+    return Grid(rows, cols, cells)
+
+def random_fill(rows, cols, density=0.2, seed=0):
+    """Each cell is a wall with probability density; the maze_corners() stay open."""
+    rng = random.Random(seed)
+    grid = Grid(rows, cols, bytearray(rng.random() < density for _ in range(rows * cols)))
+    for r, c in maze_corners(rows, cols):
+        grid.cells[r * cols + c] = 0
+    return grid
+
+MAZE_GENERATORS = {"backtracker": backtracker_maze, "kruskal": kruskal_maze, "random": random_fill}
+
+def astar(grid, start, goal, progress=None):
+    """A* over a Grid with 4-connected unit moves.
+
+    Returns (path, nodes_expanded); path is a list of (row, col) or None.
+    progress(nodes_expanded, frontier_size) is called every PROGRESS_INTERVAL
+    nodes and may raise SearchCancelled to abort.
+    """
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return None, 0
+    cols = grid.cols
+    source, target = grid.index(start), grid.index(goal)
+    goal_r, goal_c = goal
+    best_g = {source: 0}
+    parent = {source: -1}
+    h = abs(start[0] - goal_r) + abs(start[1] - goal_c)
+    open_list = [(h, h, source)]
+    expanded = 0
+
+    while open_list:
+        f, h, current = heapq.heappop(open_list)
+        g = f - h
+        if g > best_g[current]:
+            continue  # superseded by a cheaper entry pushed later
+        if current == target:
+            return rebuild_path(grid, parent, current), expanded
+        expanded += 1
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, len(open_list))
+        g += 1
+        for neighbor in grid.free_neighbors(current):
+            if g < best_g.get(neighbor, g + 1):
+                best_g[neighbor] = g
+                parent[neighbor] = current
+                r, c = divmod(neighbor, cols)
+                nh = abs(r - goal_r) + abs(c - goal_c)
+                heapq.heappush(open_list, (g + nh, nh, neighbor))
+
+    return None, expanded
+
+def rebuild_path(grid, parent, index):
+    path = []
+    while index != -1:
+        path.append(grid.position(index))
+        index = parent[index]
+    return path[::-1]
+
+# --- Breadth-first search ---
+# Unit-cost BFS needs no priority queue: a flat list consumed through a head
+# pointer is the FIFO, and a parent-index array replaces per-entry path copies.
+
+def bfs(grid, start, goal, progress=None, visit=None, batch=PROGRESS_INTERVAL):
+    """Same contract as astar(); nodes_expanded counts dequeued cells.
+
+    visit(indices), if given, receives the flat indices of each run of `batch`
+    dequeued cells, for animating the frontier; it may raise SearchCancelled.
+    """
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return None, 0
+    cols, cells, free, size = grid.cols, grid.cells, grid.free, grid.size
+    source, target = grid.index(start), grid.index(goal)
+    parent = array("i", [-2]) * size  # -2 = unvisited, -1 = the source
+    parent[source] = -1
+    queue = [source]
+    head = 0
+
+    while head < len(queue):
+        current = queue[head]
+        head += 1
+        if current == target:
+            return rebuild_path(grid, parent, current), head
+        if progress is not None and head % PROGRESS_INTERVAL == 0:
+            progress(head, len(queue) - head)
+        if visit is not None and head % batch == 0:
+            visit(queue[head - batch:head])
+        col = current % cols
+        for neighbor in (current - cols if current >= cols else -1,
+                         current + cols if current + cols < size else -1,
+                         current - 1 if col > 0 else -1,
+                         current + 1 if col < cols - 1 else -1):
+            if neighbor >= 0 and parent[neighbor] == -2 and cells[neighbor] == free:
+                parent[neighbor] = current
+                queue.append(neighbor)
+
+    return None, head
+
+def bfs_wavefront(grid, start, goal=None, progress=None):
+    """Vectorized BFS distance field (requires numpy).
+
+    Expands a whole layer per step with index arithmetic and masks on the
+    flat cell array. Returns a rows x cols int32 array of step counts from
+    start, -1 for unreached cells (all of them if start is not open); stops
+    early once goal is labelled. progress(cells_reached, frontier_size) is
+    called once per layer.
+    """
+    if np is None:
+        raise ImportError("bfs_wavefront requires numpy")
+    cols, size = grid.cols, grid.size
+    passable = np.frombuffer(grid.cells, dtype=np.uint8) == grid.free
+    dist = np.full(size, -1, dtype=np.int32)
+    if not grid.is_open(start):
+        return dist.reshape(grid.rows, cols)
+    if goal is not None and not grid.is_open(goal):
+        goal = None
+    source = grid.index(start)
+    target = -1 if goal is None else grid.index(goal)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    depth = 0
+    reached = 1
+
+    while frontier.size:
+        if target >= 0 and dist[target] >= 0:
+            break
+        depth += 1
+        col = frontier % cols
+        candidates = np.concatenate((frontier - cols, frontier + cols,
+                                     frontier[col > 0] - 1, frontier[col < cols - 1] + 1))
+        candidates = candidates[(candidates >= 0) & (candidates < size)]
+        candidates = candidates[passable[candidates] & (dist[candidates] < 0)]
+        frontier = np.unique(candidates)
+        dist[frontier] = depth
+        reached += frontier.size
+        if progress is not None:
+            progress(reached, frontier.size)
+
+    return dist.reshape(grid.rows, cols)
+
+def wavefront_path(grid, dist, goal):
+    """Walks a bfs_wavefront field downhill from goal; returns the path or None."""
+    if not grid.is_open(goal):
+        return None
+    dist = dist.ravel()
+    current = grid.index(goal)
+    if dist[current] < 0:
+        return None
+    path = [current]
+    while dist[current] > 0:
+        current = next(n for n in grid.free_neighbors(current) if dist[n] == dist[current] - 1)
+        path.append(current)
+    return [grid.position(i) for i in reversed(path)]
+
+# --- Bounded-suboptimal and anytime search ---
+# Inflating the heuristic by a weight w >= 1 makes A* greedier: it expands far
+# fewer nodes and the path it returns costs at most w times the optimum.
+# ARA* runs a sequence of such searches with shrinking weights, reusing the
+# previous g-values, and publishes each improved path with its proven bound.
+
+def weighted_astar(grid, start, goal, weight=1.5, progress=None):
+    """A* on f = g + weight * h; same contract as astar(), path cost <= weight * optimal."""
+    path, _, expanded = next(ara_star_iter(grid, start, goal, weight, weight, progress=progress), (None, INF, 0))
+    return path, expanded
+
+def ara_star_iter(grid, start, goal, initial_weight=3.0, weight_step=0.5, deadline=None, progress=None):
+    """Yields (path, bound, nodes_expanded) for every improved path.
+
+    bound is the proven suboptimality factor (1.0 once the path is optimal).
+    If no path exists, yields (None, INF, nodes_expanded) once. Stops when
+    the path is optimal, when no path exists, or once
+    time.perf_counter() passes deadline; the caller may also just stop
+    iterating.
+    """
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        yield None, INF, 0
+        return
+    cols = grid.cols
+    source, target = grid.index(start), grid.index(goal)
+    goal_r, goal_c = goal
+
+    def h(cell):
+        r, c = divmod(cell, cols)
+        return abs(r - goal_r) + abs(c - goal_c)
+
+    best_g = {source: 0}
+    parent = {source: -1}
+    open_cells = {source}
+    closed = set()
+    incons = set()
+    weight = initial_weight
+    last_bound = INF
+    open_list = [(weight * h(source), h(source), source)]
+    expanded = 0
+
+    while True:
+        # ImprovePath: expand until no open cell could beat the goal's cost.
+        while open_list:
+            f, hc, cell = open_list[0]
+            if cell not in open_cells or f != best_g[cell] + weight * hc:
+                heapq.heappop(open_list)  # stale entry
+                continue
+            if best_g.get(target, INF) <= f:
+                break
+            heapq.heappop(open_list)
+            open_cells.discard(cell)
+            closed.add(cell)
+            expanded += 1
+            if expanded % PROGRESS_INTERVAL == 0:
+                if progress is not None:
+                    progress(expanded, len(open_cells))
+                if deadline is not None and time.perf_counter() > deadline:
+                    return
+            g = best_g[cell] + 1
+            for neighbor in grid.free_neighbors(cell):
+                if g < best_g.get(neighbor, INF):
+                    best_g[neighbor] = g
+                    parent[neighbor] = cell
+                    if neighbor in closed:
+                        incons.add(neighbor)
+                    else:
+                        open_cells.add(neighbor)
+                        nh = h(neighbor)
+                        heapq.heappush(open_list, (g + weight * nh, nh, neighbor))
+
+        if target not in best_g:
+            yield None, INF, expanded
+            return
+        lower = min((best_g[c] + h(c) for c in open_cells | incons), default=best_g[target])
+        bound = max(1.0, min(weight, best_g[target] / lower)) if lower else 1.0
+        if bound < last_bound:
+            last_bound = bound
+            yield rebuild_path(grid, parent, target), bound, expanded
+        if bound <= 1.0 or weight <= 1.0:
+            return
+
+        weight = max(1.0, weight - weight_step)
+        open_cells |= incons
+        incons = set()
+        closed = set()
+        open_list = [(best_g[c] + weight * h(c), h(c), c) for c in open_cells]
+        heapq.heapify(open_list)
+
+def ara_star(grid, start, goal, time_budget=0.05, initial_weight=3.0, weight_step=0.5, progress=None):
+    """Best path ARA* finds within time_budget seconds: (path, bound, nodes_expanded).
+
+    path is None (and bound INF) if not even the first, greediest search
+    finished in time.
+    """
+    deadline = time.perf_counter() + time_budget
+    best = (None, INF, 0)
+    for best in ara_star_iter(grid, start, goal, initial_weight, weight_step, deadline, progress):
+        pass
+    return best
+
+# --- Jump Point Search (4-connected) ---
+# On a uniform-cost grid many shortest paths are permutations of the same
+# moves. JPS only expands "jump points": cells reached by running straight
+# until the goal, a dead end, or a cell with a forced neighbor (an opening
+# next to a wall that no symmetric path could reach more cheaply). Vertical
+# runs also stop where a horizontal run would find a jump point, which is what
+# keeps the 4-connected variant optimal.
+
+def jps(grid, start, goal, progress=None):
+    """Same contract as astar(); nodes_expanded counts jump points."""
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return None, 0
+    rows, cols, cells, free = grid.rows, grid.cols, grid.cells, grid.free
+    goal_r, goal_c = goal
+
+    target = goal_r * cols + goal_c
+    last_row = rows - 1
+
+    def jump(r, c, dr, dc):
+        # Flat-index walk; returns the jump point as (row, col) or None.
+        i = r * cols + c
+        if dc:
+            above, below = r > 0, r < last_row
+            while True:
+                c += dc
+                i += dc
+                if not 0 <= c < cols or cells[i] != free:
+                    return None
+                if i == target:
+                    return r, c
+                if ((above and cells[i - cols] == free and cells[i - cols - dc] != free) or
+                        (below and cells[i + cols] == free and cells[i + cols - dc] != free)):
+                    return r, c
+        step = dr * cols
+        while True:
+            r += dr
+            i += step
+            if not 0 <= r < rows or cells[i] != free:
+                return None
+            if i == target:
+                return r, c
+            left, right = c > 0, c < cols - 1
+            if ((left and cells[i - 1] == free and cells[i - 1 - step] != free) or
+                    (right and cells[i + 1] == free and cells[i + 1 - step] != free)):
+                return r, c
+            if jump(r, c, 0, 1) or jump(r, c, 0, -1):
+                return r, c
+
+    def directions(r, c, parent):
+        if parent is None:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        pr, pc = parent
+        dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+        if dc:
+            return [(0, dc), (-1, 0), (1, 0)]
+        return [(dr, 0), (0, -1), (0, 1)]
+
+    h = abs(start[0] - goal_r) + abs(start[1] - goal_c)
+    best_g = {start: 0}
+    parent = {start: None}
+    open_list = [(h, h, start)]
+    expanded = 0
+
+    while open_list:
+        f, h, current = heapq.heappop(open_list)
+        g = f - h
+        if g > best_g[current]:
+            continue
+        if current == goal:
+            return expand_jumps(parent, current), expanded
+        expanded += 1
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, len(open_list))
+        r, c = current
+        for dr, dc in directions(r, c, parent[current]):
+            point = jump(r, c, dr, dc)
+            if point is None:
+                continue
+            ng = g + abs(point[0] - r) + abs(point[1] - c)
+            if ng < best_g.get(point, ng + 1):
+                best_g[point] = ng
+                parent[point] = current
+                nh = abs(point[0] - goal_r) + abs(point[1] - goal_c)
+                heapq.heappush(open_list, (ng + nh, nh, point))
+
+    return None, expanded
+
+def expand_jumps(parent, point):
+    # Jump points are joined by straight runs; fill in the cells between them.
+    points = []
+    while point is not None:
+        points.append(point)
+        point = parent[point]
+    points.reverse()
+    path = [points[0]]
+    for r, c in points[1:]:
+        pr, pc = path[-1]
+        dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+        while (pr, pc) != (r, c):
+            pr, pc = pr + dr, pc + dc
+            path.append((pr, pc))
+    return path
+
+# --- Distance fields ---
+# One multi-source BFS labels every free cell with its step count to the
+# nearest source. A shortest path from any cell is then a downhill walk, so a
+# query costs O(path length) however large the map is, and "nearest exit"
+# queries come for free by seeding the BFS with every exit.
+
+UNREACHED = 0xFFFFFFFF
+FIELD_HEADER = struct.Struct("=4sIII")  # magic, rows, cols, crc32 of the grid
+FIELD_MAGIC = b"GDF1"
+
+class DistanceField:
+    """Steps from every cell of a grid to the nearest source.
+
+    dist is a flat sequence of uint32 (an array when built, a memoryview over
+    a read-only mmap when loaded); walls and cells cut off from every source
+    hold UNREACHED. The field describes the grid as it was when built; check
+    is_stale() after wall edits.
+    """
+
+    def __init__(self, grid, dist, checksum=None):
+        self.grid = grid
+        self.dist = dist
+        self.checksum = zlib.crc32(grid.cells) if checksum is None else checksum
+        self.version = grid.version
+
+    @classmethod
+    def build(cls, grid, sources, progress=None):
+        """BFS outward from every (row, col) in sources at once.
+
+        progress(cells_labelled, frontier_size) is called every
+        PROGRESS_INTERVAL cells and may raise SearchCancelled.
+        """
+        cols, cells, free, size = grid.cols, grid.cells, grid.free, grid.size
+        dist = array("I", [UNREACHED]) * size
+        queue = []
+        for pos in sources:
+            index = grid.index(pos)
+            if cells[index] == free and dist[index] == UNREACHED:
+                dist[index] = 0
+                queue.append(index)
+
+        for done, current in enumerate(queue, 1):
+            if progress is not None and done % PROGRESS_INTERVAL == 0:
+                progress(done, len(queue) - done)
+            d = dist[current] + 1
+            col = current % cols
+            for neighbor in (current - cols if current >= cols else -1,
+                             current + cols if current + cols < size else -1,
+                             current - 1 if col > 0 else -1,
+                             current + 1 if col < cols - 1 else -1):
+                if neighbor >= 0 and dist[neighbor] == UNREACHED and cells[neighbor] == free:
+                    dist[neighbor] = d
+                    queue.append(neighbor)
+
+        return cls(grid, dist)
+
+    def is_stale(self):
+        return self.grid.version != self.version
+
+    def distance(self, pos):
+        """Steps from pos to the nearest source, or None if there is no path."""
+        if not self.grid.in_bounds(*pos):
+            return None
+        d = self.dist[self.grid.index(pos)]
+        return None if d == UNREACHED else d
+
+    def path_from(self, start):
+        """Shortest path from start to its nearest source, or None."""
+        grid, dist = self.grid, self.dist
+        if not grid.in_bounds(*start):
+            return None
+        cols, size = grid.cols, grid.size
+        current = grid.index(start)
+        d = dist[current]
+        if d == UNREACHED:
+            return None
+        path = [current]
+        while d:
+            d -= 1
+            col = current % cols
+            for neighbor in (current - cols, current + cols,
+                             current - 1 if col > 0 else -1,
+                             current + 1 if col < cols - 1 else -1):
+                if 0 <= neighbor < size and dist[neighbor] == d:
+                    break
+            current = neighbor
+            path.append(current)
+        return [grid.position(i) for i in path]
+
+    def save(self, path):
+        grid = self.grid
+        with open(path, "wb") as f:
+            f.write(FIELD_HEADER.pack(FIELD_MAGIC, grid.rows, grid.cols, self.checksum))
+            f.write(memoryview(self.dist).cast("B"))
+
+    @classmethod
+    def load(cls, grid, path):
+        """Memory-maps a field saved by save(); raises ValueError if it was
+        built for a different grid."""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, cols, checksum = FIELD_HEADER.unpack_from(data)
+        if (magic != FIELD_MAGIC or (rows, cols) != (grid.rows, grid.cols)
+                or checksum != zlib.crc32(grid.cells)
+                or len(data) != FIELD_HEADER.size + 4 * grid.size):
+            raise ValueError("Saved distance field does not match this grid")
+        return cls(grid, memoryview(data)[FIELD_HEADER.size:].cast("I"), checksum)
+
+# --- Path cache ---
+
+class PathCache:
+    """LRU cache of shortest paths for one Grid, keyed on (start, goal).
+
+    Entries belong to the grid version they were computed on; the first
+    lookup after an edit (Grid.set_wall bumps the version) drops them all.
+    Any stretch of a shortest path is itself a shortest path, so when a
+    cached path runs through both query points the slice between them is
+    returned as a subpath hit. That needs an optimal solver; pass
+    subpaths=False for anything else (HPA*, weighted A*). Queries with an
+    endpoint that is not Grid.is_open bypass the cache entirely, so a slice
+    can never end on a wall the solver would refuse.
+    """
+
+    def __init__(self, grid, solver=astar, capacity=1024, subpaths=True):
+        self.grid = grid
+        self.solver = solver
+        self.capacity = capacity
+        self.subpaths = subpaths
+        self.version = grid.version
+        self.entries = OrderedDict()  # (start, goal) -> (path, {cell: position in path})
+        self.through = {}             # cell -> keys of cached paths that visit it
+        self.hits = self.subpath_hits = self.misses = self.evictions = self.invalidations = 0
+
+    def check_version(self):
+        if self.grid.version != self.version:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.through.clear()
+            self.version = self.grid.version
+
+    def lookup(self, start, goal):
+        """Returns (hit, path); path may be None for a cached "no path"."""
+        self.check_version()
+        if not (self.grid.is_open(start) and self.grid.is_open(goal)):
+            return False, None
+        entry = self.entries.get((start, goal))
+        if entry is not None:
+            self.entries.move_to_end((start, goal))
+            self.hits += 1
+            return True, entry[0] and list(entry[0])
+        if self.subpaths:
+            for key in self.through.get(start, ()):
+                path, positions = self.entries[key]
+                if goal in positions:
+                    self.entries.move_to_end(key)
+                    self.subpath_hits += 1
+                    i, j = positions[start], positions[goal]
+                    return True, path[i:j + 1] if i <= j else path[j:i + 1][::-1]
+        self.misses += 1
+        return False, None
+
+    def store(self, start, goal, path):
+        """Caches a path computed on the grid as it is now."""
+        self.check_version()
+        key = (start, goal)
+        if key in self.entries or not (self.grid.is_open(start) and self.grid.is_open(goal)):
+            return
+        positions = {cell: i for i, cell in enumerate(path)} if path and self.subpaths else {}
+        self.entries[key] = (path, positions)
+        for cell in positions:
+            self.through.setdefault(cell, set()).add(key)
+        while len(self.entries) > self.capacity:
+            old_key, (_, old_positions) = self.entries.popitem(last=False)
+            for cell in old_positions:
+                keys = self.through[cell]
+                keys.discard(old_key)
+                if not keys:
+                    del self.through[cell]
+            self.evictions += 1
+
+    def find_path(self, start, goal):
+        hit, path = self.lookup(start, goal)
+        if not hit:
+            path = self.solver(self.grid, start, goal)[0]
+            self.store(start, goal, path)
+        return path
+
+    def stats(self):
+        return {"entries": len(self.entries), "hits": self.hits, "subpath_hits": self.subpath_hits,
+                "misses": self.misses, "evictions": self.evictions, "invalidations": self.invalidations}
+
+# --- Hierarchical pathfinding (HPA*) ---
+
+def bounded_bfs(grid, source, bounds, target=None):
+    """BFS restricted to bounds = (r0, c0, r1, c1), half-open.
+
+    Returns the parent map of every reached cell (source maps to -1); stops
+    early once target is reached.
+    """
+    r0, c0, r1, c1 = bounds
+    cols = grid.cols
+    parent = {source: -1}
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            break
+        for neighbor in grid.free_neighbors(current):
+            if neighbor not in parent:
+                r, c = divmod(neighbor, cols)
+                if r0 <= r < r1 and c0 <= c < c1:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+    return parent
+
+def parent_depths(parent, cells):
+    # Path lengths from the BFS source to each of `cells` that was reached.
+    depths = {}
+    for cell in cells:
+        if cell in parent:
+            depth, node = 0, cell
+            while parent[node] != -1:
+                node = parent[node]
+                depth += 1
+            depths[cell] = depth
+    return depths
+
+class HierarchicalPathfinder:
+    """HPA*: plans over an abstract graph of cluster entrances, then refines it.
+
+    The grid is cut into cluster_size x cluster_size clusters. Along every run
+    of open cells shared by two neighboring clusters a transition is placed
+    every `spacing` cells (always at least one), and the transitions inside a
+    cluster are linked by their in-cluster distances. Building the graph is
+    the expensive part and is done once per map; each query then only
+    searches the clusters of its start and goal plus the abstract graph.
+    Smaller clusters and spacing give paths closer to optimal at the cost of
+    a larger graph.
+    """
+
+    def __init__(self, grid, cluster_size=16, spacing=6, build=True):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.spacing = spacing
+        self.node_of = {}   # cell -> abstract node
+        self.node_cells = []
+        self.node_rows = []
+        self.node_cols = []
+        self.edges = []     # abstract node -> {abstract node: cost}
+        self.cluster_nodes = {}
+        self.segments = {}  # (cell, cell) -> refined cells between two transitions
+        if build:
+            self.build()
+
+    def cluster_bounds(self, cell):
+        size = self.cluster_size
+        r, c = divmod(cell, self.grid.cols)
+        r0, c0 = r - r % size, c - c % size
+        return r0, c0, min(r0 + size, self.grid.rows), min(c0 + size, self.grid.cols)
+
+    def add_node(self, cell):
+        node = self.node_of.get(cell)
+        if node is None:
+            node = self.node_of[cell] = len(self.node_cells)
+            self.node_cells.append(cell)
+            r, c = divmod(cell, self.grid.cols)
+            self.node_rows.append(r)
+            self.node_cols.append(c)
+            self.edges.append({})
+            self.cluster_nodes.setdefault(self.cluster_bounds(cell), []).append(node)
+        return node
+
+    def link(self, a, b, cost):
+        if cost < self.edges[a].get(b, cost + 1):
+            self.edges[a][b] = self.edges[b][a] = cost
+
+    def add_transitions(self, pairs):
+        # pairs: (cell, cell across the border) for one cluster-wide border segment
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and all(self.grid.cells[cell] == self.grid.free for cell in pair):
+                run.append(pair)
+                continue
+            if run:
+                if len(run) > self.spacing:
+                    picks = run[::self.spacing]
+                    if (len(run) - 1) % self.spacing:
+                        picks.append(run[-1])
+                else:
+                    picks = [run[len(run) // 2]]
+                for inside, outside in picks:
+                    self.link(self.add_node(inside), self.add_node(outside), 1)
+                run = []
+
+    def build(self):
+        grid, size = self.grid, self.cluster_size
+        rows, cols = grid.rows, grid.cols
+        for border in range(size, rows, size):
+            for c0 in range(0, cols, size):
+                self.add_transitions([((border - 1) * cols + c, border * cols + c)
+                                      for c in range(c0, min(c0 + size, cols))])
+        for border in range(size, cols, size):
+            for r0 in range(0, rows, size):
+                self.add_transitions([(r * cols + border - 1, r * cols + border)
+                                      for r in range(r0, min(r0 + size, rows))])
+        for bounds, nodes in self.cluster_nodes.items():
+            cells = [self.node_cells[n] for n in nodes]
+            for node in nodes:
+                depths = parent_depths(bounded_bfs(grid, self.node_cells[node], bounds), cells)
+                for other in nodes:
+                    cell = self.node_cells[other]
+                    if other != node and cell in depths:
+                        self.link(node, other, depths[cell])
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump({"shape": (self.grid.rows, self.grid.cols),
+                         "checksum": zlib.crc32(self.grid.cells),
+                         "cluster_size": self.cluster_size, "spacing": self.spacing,
+                         "node_cells": self.node_cells, "edges": self.edges}, f)
+
+    @classmethod
+    def load(cls, grid, path):
+        """Loads a graph saved by save(); raises ValueError if the grid changed since."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data["shape"] != (grid.rows, grid.cols) or data["checksum"] != zlib.crc32(grid.cells):
+            raise ValueError("Saved abstract graph does not match this grid")
+        finder = cls(grid, data["cluster_size"], data["spacing"], build=False)
+        for cell in data["node_cells"]:
+            finder.add_node(cell)
+        finder.edges = data["edges"]
+        return finder
+
+    def find_path(self, start, goal, refine=True):
+        """Returns (path, abstract_nodes_expanded).
+
+        With refine=False the path only lists the abstract waypoints, which is
+        enough when the caller just needs the route or its length.
+        """
+        grid = self.grid
+        if not (grid.is_open(start) and grid.is_open(goal)):
+            return None, 0
+        source, target = grid.index(start), grid.index(goal)
+        source_bounds, target_bounds = self.cluster_bounds(source), self.cluster_bounds(target)
+
+        # Temporary links from start and goal to the transitions of their
+        # clusters, plus a direct one when they share a cluster.
+        START, GOAL = -1, -2
+        source_parent = bounded_bfs(grid, source, source_bounds)
+        start_links = self.cluster_links(source_parent, source_bounds)
+        if target in source_parent:
+            start_links[GOAL] = parent_depths(source_parent, [target])[target]
+        goal_links = self.cluster_links(bounded_bfs(grid, target, target_bounds), target_bounds)
+
+        goal_r, goal_c = goal
+        node_rows, node_cols = self.node_rows, self.node_cols
+        best_g = {START: 0}
+        parent = {START: None}
+        h = abs(start[0] - goal_r) + abs(start[1] - goal_c)
+        open_list = [(h, h, START)]
+        expanded = 0
+        while open_list:
+            f, h, node = heapq.heappop(open_list)
+            g = f - h
+            if g > best_g[node]:
+                continue
+            if node == GOAL:
+                break
+            expanded += 1
+            if node in goal_links:
+                ng = g + goal_links[node]
+                if ng < best_g.get(GOAL, ng + 1):
+                    best_g[GOAL] = ng
+                    parent[GOAL] = node
+                    heapq.heappush(open_list, (ng, 0, GOAL))
+            for neighbor, cost in (start_links if node == START else self.edges[node]).items():
+                ng = g + cost
+                if ng < best_g.get(neighbor, ng + 1):
+                    best_g[neighbor] = ng
+                    parent[neighbor] = node
+                    nh = 0 if neighbor == GOAL else abs(node_rows[neighbor] - goal_r) + abs(node_cols[neighbor] - goal_c)
+                    heapq.heappush(open_list, (ng + nh, nh, neighbor))
+        else:
+            return None, expanded
+
+        waypoints = []
+        while node is not None:
+            waypoints.append(source if node == START else target if node == GOAL else self.node_cells[node])
+            node = parent[node]
+        waypoints.reverse()
+        if not refine:
+            return [grid.position(cell) for cell in waypoints], expanded
+
+        path = [waypoints[0]]
+        last = len(waypoints) - 2
+        for i, (a, b) in enumerate(zip(waypoints, waypoints[1:])):
+            if b in grid.free_neighbors(a):
+                path.append(b)
+                continue
+            # Segments between two transitions are shared by later queries.
+            segment = self.segments.get((a, b)) if 0 < i < last else None
+            if segment is None:
+                segment_parent = bounded_bfs(grid, a, self.cluster_bounds(a), b)
+                segment = []
+                cell = b
+                while cell != a:
+                    segment.append(cell)
+                    cell = segment_parent[cell]
+                segment.reverse()
+                if 0 < i < last:
+                    self.segments[a, b] = segment
+            path.extend(segment)
+        return [grid.position(cell) for cell in path], expanded
+
+    def cluster_links(self, parent, bounds):
+        nodes = self.cluster_nodes.get(bounds, [])
+        depths = parent_depths(parent, [self.node_cells[n] for n in nodes])
+        return {n: depths[self.node_cells[n]] for n in nodes if self.node_cells[n] in depths}
+
+# --- Incremental replanning (D* Lite) ---
+
+class DStarLite:
+    """D* Lite: keeps its search between wall edits and repairs it in place.
+
+    The search runs backward from the goal, so g[cell] is the distance from a
+    cell to the goal and rhs[cell] a one-step lookahead of it. When cells
+    change, only the vertices whose g/rhs become inconsistent are put back
+    on the queue; the rest of the previous search is reused. The start may
+    move between replans (km keeps old queue keys valid).
+
+        planner = DStarLite(grid)
+        path, expanded = planner.plan(start, goal)
+        planner.update_cells([((r, c), True)])   # (cell, is_wall) pairs
+        path, expanded = planner.replan()
+
+    plan() and replan() take the usual progress(nodes_expanded, queue_size)
+    callback. It runs between expansions, so a SearchCancelled raised from it
+    leaves the search consistent and the next replan() picks it up.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.start = self.goal = None
+
+    def h(self, a, b):
+        cols = self.grid.cols
+        return abs(a // cols - b // cols) + abs(a % cols - b % cols)
+
+    def cost(self, a, b):
+        cells, free = self.grid.cells, self.grid.free
+        return 1 if cells[a] == free and cells[b] == free else INF
+
+    def neighbors(self, index):
+        # Every in-bounds neighbor, walls included: edges into walls cost INF.
+        cols = self.grid.cols
+        col = index % cols
+        result = []
+        if index >= cols:
+            result.append(index - cols)
+        if index + cols < self.grid.size:
+            result.append(index + cols)
+        if col > 0:
+            result.append(index - 1)
+        if col < cols - 1:
+            result.append(index + 1)
+        return result
+
+    def key(self, cell):
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (best + self.h(self.start, cell) + self.km, best)
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+
+    def update_vertex(self, cell):
+        g, rhs = self.g, self.rhs
+        if cell != self.goal:
+            # rhs = min over neighbors of cost + g, with the unit cost inlined.
+            cells, free = self.grid.cells, self.grid.free
+            best = INF
+            if cells[cell] == free:
+                for n in self.neighbors(cell):
+                    if cells[n] == free:
+                        value = g.get(n, INF) + 1
+                        if value < best:
+                            best = value
+            rhs[cell] = best
+        self.queued.pop(cell, None)
+        if g.get(cell, INF) != rhs.get(cell, INF):
+            self.push(cell)
+
+    def compute_shortest_path(self, progress=None):
+        queue, queued, g, rhs = self.queue, self.queued, self.g, self.rhs
+        expanded = 0
+        while queue:
+            key, cell = queue[0]
+            if queued.get(cell) != key:
+                heapq.heappop(queue)  # removed or re-keyed since it was pushed
+                continue
+            start = self.start
+            if key >= self.key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+                progress(expanded, len(queued))
+            heapq.heappop(queue)
+            del queued[cell]
+            expanded += 1
+            new_key = self.key(cell)
+            if key < new_key:
+                self.push(cell)
+            elif g.get(cell, INF) > rhs.get(cell, INF):
+                g[cell] = rhs[cell]
+                for n in self.neighbors(cell):
+                    self.update_vertex(n)
+            else:
+                g[cell] = INF
+                self.update_vertex(cell)
+                for n in self.neighbors(cell):
+                    self.update_vertex(n)
+        return expanded
+
+    def plan(self, start, goal, progress=None):
+        """Plans from scratch; returns (path, nodes_expanded)."""
+        self.start, self.goal = self.grid.index(start), self.grid.index(goal)
+        self.last_start = self.start
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = []
+        self.queued = {}
+        self.push(self.goal)
+        expanded = self.compute_shortest_path(progress)
+        return self.path(), expanded
+
+    def update_cells(self, changes):
+        """Applies ((row, col), is_wall) edits; the next replan() repairs the search."""
+        for (r, c), wall in changes:
+            if self.grid.is_free(r, c) == (not wall):
+                continue
+            self.grid.set_wall(r, c, wall)
+            cell = self.grid.index((r, c))
+            self.update_vertex(cell)
+            for n in self.neighbors(cell):
+                self.update_vertex(n)
+
+    def replan(self, start=None, progress=None):
+        """Repairs the search after edits, optionally from a new start; returns (path, nodes_expanded)."""
+        if start is not None:
+            self.start = self.grid.index(start)
+            self.km += self.h(self.last_start, self.start)
+            self.last_start = self.start
+        expanded = self.compute_shortest_path(progress)
+        return self.path(), expanded
+
+    def path(self):
+        if self.g.get(self.start, INF) == INF:
+            return None
+        g = self.g
+        cell = self.start
+        path = [cell]
+        while cell != self.goal:
+            cell = min(self.neighbors(cell), key=lambda n: self.cost(cell, n) + g.get(n, INF))
+            path.append(cell)
+        return [self.grid.position(cell) for cell in path]
@@ -0,0 +1,130 @@
+import argparse
+import csv
+import json
+import platform
+import time
+import tracemalloc
+
+import GridSearch
+import MazeSolver
+from GridSearch import MAZE_GENERATORS, astar, bfs, jps, maze_corners, weighted_astar
+
+# Headless benchmark: every engine over a matrix of generated mazes, with
+# warmup and repeats. Timed runs go without callbacks; one extra run under
+# tracemalloc records peak memory and, with PROGRESS_INTERVAL dropped to 1 in
+# the engine modules, the frontier after every expansion. Tracing and the
+# per-expansion callback slow that run, so it is not timed.
+
+FIELDS = ["generator", "size", "density", "seed", "engine", "path_length", "nodes", "peak_frontier",
+          "peak_kib", "min_ms", "p50_ms", "p90_ms", "max_ms", "repeats"]
+
+def maze_solver_engine(search):
+    # MazeSolver's own solvers read its module-level MAZE, START and GOAL.
+    def run(grid, start, goal, progress):
+        MazeSolver.set_maze(grid, start, goal)
+        return search(progress)[:2]
+    return run
+
+ENGINES = {
+    "bfs": bfs,
+    "astar": astar,
+    "jps": jps,
+    "weighted": lambda grid, start, goal, progress: weighted_astar(grid, start, goal, 1.5, progress),
+    "maze_astar": maze_solver_engine(MazeSolver.astar),  # the GUI's queue.PriorityQueue A*
+}
+if GridSearch.np is not None:
+    ENGINES["wavefront"] = maze_solver_engine(MazeSolver.wavefront)
+
+# Largest maze an engine runs on by default; maze_astar takes minutes at 1001.
+SIZE_LIMITS = {"maze_astar": 301}
+
+# Modules whose engines read PROGRESS_INTERVAL at call time.
+INTERVAL_MODULES = [GridSearch, MazeSolver]
+
+def percentile(values, fraction):
+    # Nearest-rank percentile; values must be sorted.
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def measure(engine, grid, start, goal, warmup=1, repeats=5):
+    for _ in range(warmup):
+        engine(grid, start, goal, None)
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        path, nodes = engine(grid, start, goal, None)
+        times.append(1000 * (time.perf_counter() - start_time))
+    times.sort()
+
+    peak_frontier = 0
+    def progress(expanded, frontier):
+        nonlocal peak_frontier
+        peak_frontier = max(peak_frontier, frontier)
+    intervals = [module.PROGRESS_INTERVAL for module in INTERVAL_MODULES]
+    for module in INTERVAL_MODULES:
+        module.PROGRESS_INTERVAL = 1
+    tracemalloc.start()
+    try:
+        engine(grid, start, goal, progress)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        for module, interval in zip(INTERVAL_MODULES, intervals):
+            module.PROGRESS_INTERVAL = interval
+
+    return {"path_length": len(path) if path else None, "nodes": nodes, "peak_frontier": peak_frontier,
+            "peak_kib": round(peak / 1024, 1), "min_ms": round(times[0], 3),
+            "p50_ms": round(percentile(times, 0.5), 3), "p90_ms": round(percentile(times, 0.9), 3),
+            "max_ms": round(times[-1], 3), "repeats": repeats}
+
+def run_matrix(sizes, generators, densities, engines, seed=0, warmup=1, repeats=5, size_limits=SIZE_LIMITS):
+    """Yields one result dict per (maze, engine); densities apply to "random" only
+    and engines skip sizes above their entry in size_limits."""
+    for size in sizes:
+        for generator in generators:
+            for density in densities if generator == "random" else [None]:
+                options = {} if density is None else {"density": density}
+                grid = MAZE_GENERATORS[generator](size, size, seed=seed, **options)
+                start, goal = maze_corners(size, size)
+                for name in engines:
+                    if size > size_limits.get(name, size):
+                        continue
+                    result = {"generator": generator, "size": size, "density": density, "seed": seed, "engine": name}
+                    result.update(measure(ENGINES[name], grid, start, goal, warmup, repeats))
+                    yield result
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers on generated mazes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[101, 301, 1001])
+    parser.add_argument("--generators", nargs="+", choices=list(MAZE_GENERATORS), default=list(MAZE_GENERATORS))
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.2, 0.35], help="wall densities for random")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--all-sizes", action="store_true", help="ignore SIZE_LIMITS (maze_astar stops at 301)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for result in run_matrix(args.sizes, args.generators, args.densities, args.engines,
+                             args.seed, args.warmup, args.repeats, {} if args.all_sizes else SIZE_LIMITS):
+        results.append(result)
+        density = "" if result["density"] is None else f" d={result['density']}"
+        print(f"{result['generator']}{density} {result['size']}x{result['size']} {result['engine']:>10}: "
+              f"nodes={result['nodes']}, frontier={result['peak_frontier']}, peak={result['peak_kib']}KiB, "
+              f"p50={result['p50_ms']}ms, p90={result['p90_ms']}ms")
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json)
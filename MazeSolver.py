@@ -1,10 +1,17 @@
 import tkinter as tk
 from tkinter import messagebox
+import sys
 import time
-from queue import PriorityQueue, Queue
+from collections import deque
+from queue import PriorityQueue
+
+import GridSearch
+from GridSearch import PROGRESS_INTERVAL, DistanceField, DStarLite, Grid, PathCache, ara_star, bfs_wavefront, wavefront_path
+from GridSearch import MAZE_GENERATORS, maze_corners, bfs as grid_bfs, jps as grid_jps
+from SearchRunner import SearchCancelled, SearchWorker
 
 # Maze Grid: 0 = free, 1 = wall
-MAZE = [
+MAZE = Grid.from_rows([
     [0, 1, 0, 0, 0, 1, 0, 0, 0, 0],
     [0, 1, 0, 1, 0, 1, 0, 1, 1, 0],
     [0, 0, 0, 1, 0, 0, 0, 0, 1, 0],
@@ -15,112 +22,415 @@ MAZE = [
     [0, 1, 1, 1, 1, 1, 1, 0, 1, 0],
     [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
     [1, 1, 1, 1, 1, 1, 1, 0, 0, 0],
-]
+])
 
-ROWS, COLS = len(MAZE), len(MAZE[0])
+ROWS, COLS = MAZE.rows, MAZE.cols
 CELL_SIZE = 40
+MIN_CELL_SIZE, MAX_CELL_SIZE = 2, 64  # zoom limits, in pixels
+VIEW_SIZE = 800  # largest canvas side; bigger mazes scroll
 
 START = (0, 0)
 GOAL = (9, 9)
+EXITS = [GOAL]  # sources of the distance field; right-click finds the nearest
+FIELD_PATH = None  # where a map loaded by load_maze keeps its distance field
+
+POLL_MS = 50
+ANIMATE_FRAMES = 200  # the BFS animation shows the search in about this many batches
+ANIMATE_DELAY = 0.02  # seconds the worker pauses after each batch
+ARA_BUDGET = 0.05  # seconds ARA* may spend improving its path
+
+def set_maze(grid, start=(0, 0), goal=None):
+    """Replaces MAZE with grid; GOAL defaults to the opposite corner."""
+    global MAZE, ROWS, COLS, CELL_SIZE, START, GOAL, EXITS, FIELD_PATH
+    MAZE = grid
+    ROWS, COLS = MAZE.rows, MAZE.cols
+    CELL_SIZE = max(6, min(CELL_SIZE, VIEW_SIZE // max(ROWS, COLS)))
+    START = start
+    GOAL = (ROWS - 1, COLS - 1) if goal is None else goal
+    EXITS = [GOAL]
+    FIELD_PATH = None
+
+def load_maze(path, rows=None, cols=None):
+    """Replaces MAZE with a map file (see Grid.load); START and GOAL become opposite corners."""
+    global FIELD_PATH
+    set_maze(Grid.load(path, rows, cols))
+    FIELD_PATH = path + ".field"
+
+def generate_maze(name, size, seed=0):
+    """Replaces MAZE with a seeded size x size maze from MAZE_GENERATORS."""
+    set_maze(MAZE_GENERATORS[name](size, size, seed=seed), *maze_corners(size, size))
+
+def neighbors(i, j):
+    for di, dj in [(-1,0), (1,0), (0,-1), (0,1)]:
+        ni, nj = i + di, j + dj
+        if 0 <= ni < ROWS and 0 <= nj < COLS and MAZE.is_free(ni, nj):
+            yield (ni, nj)
+
+def heuristic(pos):
+    return abs(pos[0] - GOAL[0]) + abs(pos[1] - GOAL[1])
+
+def bfs(progress=None):
+    """Returns (path, nodes_explored); path is None when GOAL is unreachable.
+
+    progress(nodes_explored, frontier_size) is called every PROGRESS_INTERVAL
+    nodes and may raise SearchCancelled to abort.
+    """
+    return grid_bfs(MAZE, START, GOAL, progress)
+
+def astar(progress=None):
+    """Same contract as bfs()."""
+    visited = [[False]*COLS for _ in range(ROWS)]
+    pq = PriorityQueue()
+    pq.put((0 + heuristic(START), 0, START, [START]))
+    nodes_explored = 0
+
+    while not pq.empty():
+        f, g, (i, j), path = pq.get()
+        nodes_explored += 1
+        if progress is not None and nodes_explored % PROGRESS_INTERVAL == 0:
+            progress(nodes_explored, pq.qsize())
+        if (i, j) == GOAL:
+            return path, nodes_explored
+        if visited[i][j]: continue
+        visited[i][j] = True
+        for ni, nj in neighbors(i, j):
+            if not visited[ni][nj]:
+                new_g = g + 1
+                pq.put((new_g + heuristic((ni, nj)), new_g, (ni, nj), path + [(ni, nj)]))
+
+    return None, nodes_explored
+
+def jps(progress=None):
+    """Same contract as bfs(), using Jump Point Search from GridSearch."""
+    return grid_jps(MAZE, START, GOAL, progress)
+
+def wavefront(progress=None):
+    """Same contract as bfs(), but labels whole BFS layers at once with numpy;
+    nodes_explored counts labelled cells."""
+    reached = [1]
+    def report(cells, frontier):
+        reached[0] = cells
+        if progress is not None:
+            progress(cells, frontier)
+    dist = bfs_wavefront(MAZE, START, GOAL, report)
+    return wavefront_path(MAZE, dist, GOAL), reached[0]
+
+def exit_field(progress=None):
+    """DistanceField towards EXITS: memory-mapped from FIELD_PATH when it was
+    saved for this map, otherwise built (and saved while the map is unedited)."""
+    cacheable = FIELD_PATH is not None and MAZE.version == 0
+    if cacheable:
+        try:
+            return DistanceField.load(MAZE, FIELD_PATH)
+        except (OSError, ValueError):
+            pass
+    field = DistanceField.build(MAZE, EXITS, progress)
+    if cacheable:
+        field.save(FIELD_PATH)
+    return field
+
+def ara(progress=None):
+    """Like bfs(), but returns (path, nodes_explored, bound): the best path ARA*
+    found within ARA_BUDGET seconds and its suboptimality bound."""
+    path, bound, nodes_explored = ara_star(MAZE, START, GOAL, ARA_BUDGET, progress=progress)
+    return path, nodes_explored, bound
 
 class MazeGUI:
+    # The canvas only holds rectangles for the cells in view (self.items maps
+    # flat index -> item id). Scrolling creates the newly exposed cells and
+    # deletes the ones that left; solving recolors just the cells whose state
+    # changed, so a redraw costs O(changed cells), not O(maze).
+
     def __init__(self, root):
         self.root = root
-        root.title("Maze Solver (BFS & A*)")
-        self.canvas = tk.Canvas(root, width=COLS*CELL_SIZE, height=ROWS*CELL_SIZE, bg='white')
-        self.canvas.pack()
-        self.draw_grid()
+        root.title("Maze Solver (BFS, A*, JPS & ARA*)")
+        self.cell_size = CELL_SIZE
+        self.items = {}
+        self.view = None  # (first row, last row, first col, last col) rendered, exclusive ends
+        self.path_cells = set()
+        self.explored = set()  # cells shown by the frontier animation
+        self.pending = deque()  # explored batches from the worker, drained by poll()
+        self.start_index, self.goal_index = MAZE.index(START), MAZE.index(GOAL)
+
+        canvas_frame = tk.Frame(root)
+        canvas_frame.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(canvas_frame, width=min(COLS*CELL_SIZE, VIEW_SIZE),
+                                height=min(ROWS*CELL_SIZE, VIEW_SIZE), bg='white', highlightthickness=0)
+        xbar = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self.scroll_x)
+        ybar = tk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self.scroll_y)
+        self.canvas.config(xscrollcommand=xbar.set, yscrollcommand=ybar.set,
+                           scrollregion=(0, 0, COLS*CELL_SIZE, ROWS*CELL_SIZE))
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        ybar.grid(row=0, column=1, sticky="ns")
+        xbar.grid(row=1, column=0, sticky="ew")
+        canvas_frame.rowconfigure(0, weight=1)
+        canvas_frame.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Button-1>", self.toggle_cell)
+        self.canvas.bind("<Button-3>", self.query_field)
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(sequence, self.on_wheel)
+        for key, factor in (("<plus>", 2), ("<equal>", 2), ("<minus>", 0.5)):
+            root.bind(key, lambda event, factor=factor: self.zoom(factor))
+        self.planner = None  # D* Lite planner, created on the first wall edit
+        self.field = None  # distance field to EXITS, built on the first right-click
+        # One path cache per algorithm, so repeating a solve is instant but
+        # switching buttons still runs (and reports) the other engine. Optimal
+        # paths only; ARA* stores a path once its bound is 1.
+        self.caches = {}
 
-        self.info = tk.Label(root, text="Select algorithm to solve.")
+        self.info = tk.Label(root, text="Select algorithm to solve, click a cell to toggle a wall, "
+                                        "or right-click one for its path to the nearest exit.")
         self.info.pack(pady=5)
 
         self.btn_frame = tk.Frame(root)
         self.btn_frame.pack()
 
-        tk.Button(self.btn_frame, text="Solve with BFS", command=self.solve_bfs).pack(side=tk.LEFT, padx=10)
-        tk.Button(self.btn_frame, text="Solve with A*", command=self.solve_astar).pack(side=tk.LEFT, padx=10)
-
-    def draw_grid(self, path=None):
-        self.canvas.delete("all")
-        for i in range(ROWS):
-            for j in range(COLS):
-                x1, y1 = j*CELL_SIZE, i*CELL_SIZE
-                x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-                if MAZE[i][j] == 1:
-                    color = "black"
-                elif (i, j) == START:
-                    color = "blue"
-                elif (i, j) == GOAL:
-                    color = "red"
-                elif path and (i, j) in path:
-                    color = "green"
-                else:
-                    color = "white"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray")
-
-    def draw_path(self, path, color):
-        for i, j in path:
-            if (i, j) not in (START, GOAL):
-                x1, y1 = j*CELL_SIZE, i*CELL_SIZE
-                x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray")
-
-    def neighbors(self, i, j):
-        for di, dj in [(-1,0), (1,0), (0,-1), (0,1)]:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < ROWS and 0 <= nj < COLS and MAZE[ni][nj] == 0:
-                yield (ni, nj)
+        self.search = SearchWorker()
+        self.search_name = None
+        self.use_cache = True
+
+        self.solve_buttons = [
+            tk.Button(self.btn_frame, text="Solve with BFS", command=self.solve_bfs),
+            tk.Button(self.btn_frame, text="Solve with A*", command=self.solve_astar),
+            tk.Button(self.btn_frame, text="Solve with JPS", command=self.solve_jps),
+            tk.Button(self.btn_frame, text="Solve with ARA*", command=self.solve_ara),
+        ]
+        if GridSearch.np is not None:
+            self.solve_buttons.append(tk.Button(self.btn_frame, text="Wavefront BFS", command=self.solve_wavefront))
+        for button in self.solve_buttons:
+            button.pack(side=tk.LEFT, padx=10)
+        self.cancel_btn = tk.Button(self.btn_frame, text="Cancel", command=self.search.cancel, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=10)
+        self.animate = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.btn_frame, text="Animate BFS", variable=self.animate).pack(side=tk.LEFT, padx=10)
+
+    # --- Rendering ---
+
+    def cell_color(self, index):
+        if MAZE.cells[index] != MAZE.free:
+            return "black"
+        if index == self.start_index:
+            return "blue"
+        if index == self.goal_index:
+            return "red"
+        if index in self.path_cells:
+            return "green"
+        if index in self.explored:
+            return "light blue"
+        return "white"
+
+    def render(self):
+        # Bring the canvas items in line with the visible cell range.
+        size, canvas = self.cell_size, self.canvas
+        width = canvas.winfo_width() if canvas.winfo_width() > 1 else int(canvas.cget("width"))
+        height = canvas.winfo_height() if canvas.winfo_height() > 1 else int(canvas.cget("height"))
+        left, top = int(canvas.canvasx(0)), int(canvas.canvasy(0))
+        view = (max(0, top // size), min(ROWS, (top + height) // size + 1),
+                max(0, left // size), min(COLS, (left + width) // size + 1))
+        if view == self.view:
+            return
+        self.view = r0, r1, c0, c1 = view
+        for index in [index for index in self.items
+                      if not (r0 <= index // COLS < r1 and c0 <= index % COLS < c1)]:
+            canvas.delete(self.items.pop(index))
+        outline = "gray" if size >= 4 else ""
+        for i in range(r0, r1):
+            for j in range(c0, c1):
+                index = i*COLS + j
+                if index not in self.items:
+                    x1, y1 = j*size, i*size
+                    self.items[index] = canvas.create_rectangle(x1, y1, x1 + size, y1 + size,
+                                                                fill=self.cell_color(index), outline=outline)
+
+    def recolor(self, indices):
+        for index in indices:
+            item = self.items.get(index)
+            if item is not None:
+                self.canvas.itemconfig(item, fill=self.cell_color(index))
+
+    def show_path(self, path):
+        path_cells = set(map(MAZE.index, path)) if path else set()
+        changed = self.path_cells ^ path_cells
+        self.path_cells = path_cells
+        self.recolor(changed)
+
+    def clear_explored(self):
+        explored, self.explored = self.explored, set()
+        self.pending.clear()
+        self.recolor(explored)
+
+    def scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.render()
+
+    def scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+
+    def on_wheel(self, event):
+        # Wheel scrolls, Shift+wheel scrolls sideways, Ctrl+wheel zooms.
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        if event.state & 0x4:
+            self.zoom(2 if step < 0 else 0.5)
+        elif event.state & 0x1:
+            self.scroll_x("scroll", step, "units")
+        else:
+            self.scroll_y("scroll", step, "units")
+
+    def zoom(self, factor):
+        size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, int(self.cell_size * factor)))
+        if size == self.cell_size:
+            return
+        canvas = self.canvas
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        # Keep the cell under the middle of the viewport in place.
+        center_x = (canvas.canvasx(0) + width / 2) / self.cell_size
+        center_y = (canvas.canvasy(0) + height / 2) / self.cell_size
+        self.cell_size = size
+        canvas.delete("all")
+        self.items.clear()
+        self.view = None
+        canvas.config(scrollregion=(0, 0, COLS*size, ROWS*size))
+        canvas.xview_moveto(max(0.0, (center_x*size - width / 2) / (COLS*size)))
+        canvas.yview_moveto(max(0.0, (center_y*size - height / 2) / (ROWS*size)))
+        self.render()
+
+    def event_cell(self, event):
+        size = self.cell_size
+        return int(self.canvas.canvasy(event.y)) // size, int(self.canvas.canvasx(event.x)) // size
+
+    # --- Editing and queries ---
+
+    def toggle_cell(self, event):
+        # Flip a wall and repair the D* Lite search instead of replanning from
+        # scratch. The edit itself is cheap; the repair runs on the worker.
+        i, j = self.event_cell(event)
+        if self.search.busy or not MAZE.in_bounds(i, j) or (i, j) in (START, GOAL):
+            return
+        if self.planner is None:
+            MAZE.set_wall(i, j, MAZE.is_free(i, j))
+            self.planner = DStarLite(MAZE)
+            search = lambda progress: self.planner.plan(START, GOAL, progress)
+        else:
+            self.planner.update_cells([((i, j), MAZE.is_free(i, j))])
+            search = lambda progress: self.planner.replan(progress=progress)
+        self.recolor([MAZE.index((i, j))])
+        self.start_search("D* Lite", search)
+
+    def query_field(self, event):
+        # Any-start query: the first one builds the distance field (one BFS
+        # from EXITS); after that each query is a downhill walk.
+        i, j = self.event_cell(event)
+        if self.search.busy or not MAZE.in_bounds(i, j):
+            return
+        self.start_search("Nearest exit", lambda progress: self.field_path((i, j), progress), use_cache=False)
+
+    def field_path(self, start, progress):
+        # Runs on the worker thread; Nodes reports the cells walked.
+        if self.field is None or self.field.is_stale():
+            self.field = exit_field(progress)
+        path = self.field.path_from(start)
+        return path, len(path) if path else 0
 
     def solve_bfs(self):
-        start_time = time.time()
-        visited = [[False]*COLS for _ in range(ROWS)]
-        queue = Queue()
-        queue.put((START, [START]))
-        visited[START[0]][START[1]] = True
-        nodes_explored = 0
-
-        while not queue.empty():
-            (i, j), path = queue.get()
-            nodes_explored += 1
-            if (i, j) == GOAL:
-                self.draw_grid(path)
-                self.info.config(text=f"BFS: Path length={len(path)}, Nodes={nodes_explored}, Time={1000*(time.time()-start_time):.2f}ms")
-                return
-            for ni, nj in self.neighbors(i, j):
-                if not visited[ni][nj]:
-                    visited[ni][nj] = True
-                    queue.put(((ni, nj), path + [(ni, nj)]))
-
-        messagebox.showinfo("BFS", "No path found!")
+        if self.animate.get():
+            self.start_search("BFS", self.animated_bfs, use_cache=False)
+        else:
+            self.start_search("BFS", bfs)
+
+    def animated_bfs(self, progress):
+        # Runs on the worker thread: hands each batch of dequeued cells to
+        # poll() and pauses so the frontier visibly grows.
+        def visit(indices):
+            if self.search.cancel_event.is_set():
+                raise SearchCancelled
+            self.pending.append(indices)
+            time.sleep(ANIMATE_DELAY)
+        batch = max(1, MAZE.size // ANIMATE_FRAMES)
+        return grid_bfs(MAZE, START, GOAL, progress, visit, batch)
 
     def solve_astar(self):
-        start_time = time.time()
-        visited = [[False]*COLS for _ in range(ROWS)]
-        pq = PriorityQueue()
-        pq.put((0 + self.heuristic(START), 0, START, [START]))
-        nodes_explored = 0
-
-        while not pq.empty():
-            f, g, (i, j), path = pq.get()
-            nodes_explored += 1
-            if (i, j) == GOAL:
-                self.draw_grid(path)
-                self.info.config(text=f"A*: Path length={len(path)}, Nodes={nodes_explored}, Time={1000*(time.time()-start_time):.2f}ms")
-                return
-            if visited[i][j]: continue
-            visited[i][j] = True
-            for ni, nj in self.neighbors(i, j):
-                if not visited[ni][nj]:
-                    new_g = g + 1
-                    pq.put((new_g + self.heuristic((ni, nj)), new_g, (ni, nj), path + [(ni, nj)]))
-
-        messagebox.showinfo("A*", "No path found!")
-
-    def heuristic(self, pos):
-        return abs(pos[0] - GOAL[0]) + abs(pos[1] - GOAL[1])
+        self.start_search("A*", astar)
+
+    def solve_jps(self):
+        self.start_search("JPS", jps)
+
+    def solve_wavefront(self):
+        self.start_search("Wavefront", wavefront)
+
+    def solve_ara(self):
+        self.start_search("ARA*", ara)
+
+    def start_search(self, name, search, use_cache=True):
+        if self.search.busy:
+            return
+        self.clear_explored()
+        cache = self.caches.setdefault(name, PathCache(MAZE))
+        hit, path = cache.lookup(START, GOAL) if use_cache else (False, None)
+        if hit:
+            self.show_path(path)
+            if path is None:
+                self.info.config(text=f"{name}: no path (cached)")
+            else:
+                self.info.config(text=f"{name}: Path length={len(path)} (cached)")
+            return
+        self.search_name = name
+        self.use_cache = use_cache
+        self.search.start(search)
+        for button in self.solve_buttons:
+            button.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.root.after(POLL_MS, self.poll)
+
+    def drain_explored(self):
+        while self.pending:
+            indices = self.pending.popleft()
+            self.explored.update(indices)
+            self.recolor(indices)
+
+    def poll(self):
+        self.drain_explored()
+        if self.search.running:
+            nodes, frontier = self.search.progress
+            self.info.config(text=f"Searching... Nodes={nodes}, Frontier={frontier}")
+            self.root.after(POLL_MS, self.poll)
+            return
+        for button in self.solve_buttons:
+            button.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        name = self.search_name
+        try:
+            path, nodes_explored, *bound = self.search.collect()
+        except SearchCancelled:
+            self.info.config(text=f"{name}: search cancelled.")
+            return
+        except Exception as error:
+            self.info.config(text=f"{name}: search failed: {error!r}")
+            return
+        bound = bound[0] if bound else 1.0
+        elapsed = self.search.elapsed
+        if path is None:
+            self.info.config(text="Select algorithm to solve.")
+            messagebox.showinfo(name, "No path found!" if bound == 1.0 else "No path found within the time budget.")
+        else:
+            self.show_path(path)
+            detail = f", Bound={bound:.3f}" if name == "ARA*" else ""
+            self.info.config(text=f"{name}: Path length={len(path)}, Nodes={nodes_explored}{detail}, Time={1000*elapsed:.2f}ms")
+        if bound == 1.0 and self.use_cache:
+            self.caches[name].store(START, GOAL, path)
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in MAZE_GENERATORS:
+        # Generated maze: a generator name, then optional size and seed.
+        generate_maze(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 101,
+                      int(sys.argv[3]) if len(sys.argv) > 3 else 0)
+    elif len(sys.argv) > 1:
+        # Map file: a PGM image, or a raw byte file followed by rows and cols.
+        rows, cols = map(int, sys.argv[2:4]) if len(sys.argv) > 3 else (None, None)
+        load_maze(sys.argv[1], rows, cols)
     root = tk.Tk()
     gui = MazeGUI(root)
     root.mainloop()
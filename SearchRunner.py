@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+# Plumbing shared by the solver modules: the progress/cancel contract every
+# search follows, the worker thread the Tk GUIs run searches on, and the
+# process-pool loop behind the --batch modes.
+
+PROGRESS_INTERVAL = 1000  # nodes between progress callbacks
+
+class SearchCancelled(Exception):
+    """Raised from a progress callback to stop a search early."""
+
+class SearchWorker:
+    """Runs one search at a time on a daemon thread for a Tk GUI.
+
+    Only the Tk thread may touch widgets, so the GUI starts a search here
+    and polls it with root.after: `progress` holds the last (nodes,
+    frontier) report while `running` is true. Once it is false, collect()
+    returns what the search returned, or re-raises any exception it raised
+    (SearchCancelled after cancel()), and frees the worker for the next run.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.cancel_event = threading.Event()
+        self.progress = (0, 0)
+        self.result = None
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def busy(self):
+        """True from start() until the outcome has been collected."""
+        return self.thread is not None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, search, *args):
+        """Runs search(progress, *args) on the worker thread."""
+        self.cancel_event.clear()
+        self.progress = (0, 0)
+        self.result = self.error = None
+        self.thread = threading.Thread(target=self.run, args=(search, args), daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, nodes, frontier):
+        # The progress callback handed to the search; runs on the worker thread.
+        if self.cancel_event.is_set():
+            raise SearchCancelled
+        self.progress = (nodes, frontier)
+
+    def run(self, search, args):
+        start_time = time.perf_counter()
+        try:
+            self.result = search(self.report, *args)
+        except Exception as error:
+            self.error = error
+        self.elapsed = time.perf_counter() - start_time
+
+    def collect(self):
+        self.thread = None
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+# --- Batch solving ---
+# Inputs are read lazily in chunks and at most two chunks per worker are in
+# flight, so memory stays flat no matter how long the input is. Results are
+# written as JSON lines in completion order; "line" gives the input position.
+
+def read_entries(lines):
+    """Yields (line number, text) per input line, skipping blank lines and
+    '#' comments; numbers count every line, skipped ones included."""
+    for number, line in enumerate(lines, 1):
+        text = line.strip()
+        if text and not text.startswith("#"):
+            yield number, text
+
+def read_chunks(lines, chunk_size):
+    chunk = []
+    for entry in read_entries(lines):
+        chunk.append(entry)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def write_results(future, out):
+    for result in future.result():
+        out.write(json.dumps(result) + "\n")
+    out.flush()
+
+def run_batch(solve_chunk, lines, out, workers=None, chunk_size=64, *args):
+    """Calls solve_chunk(entries, *args) in worker processes, where entries
+    is a list of (line number, text) pairs, and writes each returned result
+    dict to out as a JSON line."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for chunk in read_chunks(lines, chunk_size):
+            pending.add(pool.submit(solve_chunk, chunk, *args))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write_results(future, out)
+        for future in as_completed(pending):
+            write_results(future, out)
@@ -0,0 +1,541 @@
+import argparse
+import heapq
+import math
+import sys
+import time
+
+from SearchRunner import PROGRESS_INTERVAL, read_entries, run_batch
+
+# Tk-free Sudoku solvers. Boards are 9x9 lists of lists with 0 for empty
+# cells (solve_dlx also takes N^2 x N^2); every solver fills the board in
+# place and returns (solved, nodes).
+
+class SearchLimitExceeded(Exception):
+    """Raised when a search reaches its node or memory cap."""
+
+# --- Plain backtracking ---
+
+def is_valid(board, row, col, num):
+    for i in range(9):
+        if board[row][i] == num or board[i][col] == num:
+            return False
+    r, c = 3 * (row//3), 3 * (col//3)
+    for i in range(r, r+3):
+        for j in range(c, c+3):
+            if board[i][j] == num:
+                return False
+    return True
+
+def solve_dfs(board, progress=None):
+    """Row-major backtracking over digits 1-9; progress(nodes, depth) is
+    called every PROGRESS_INTERVAL digits tried."""
+    nodes = 0
+
+    def search(depth):
+        nonlocal nodes
+        for i in range(9):
+            for j in range(9):
+                if board[i][j] == 0:
+                    for num in range(1, 10):
+                        nodes += 1
+                        if progress is not None and nodes % PROGRESS_INTERVAL == 0:
+                            progress(nodes, depth)
+                        if is_valid(board, i, j, num):
+                            board[i][j] = num
+                            if search(depth + 1):
+                                return True
+                            board[i][j] = 0
+                    return False
+        return True
+
+    return search(0), nodes
+
+# --- Bitmask solver ---
+# Each row, column and box keeps a 9-bit mask of the digits it already holds,
+# so a cell's candidates are one OR and one NOT, and placing or undoing a
+# digit is three bit operations. Before every branch the solver fills in
+# naked singles (cells with one candidate) and hidden singles (digits with
+# one possible cell in a unit), then branches on the cell with the fewest
+# candidates (MRV).
+
+ALL_DIGITS = 0x1FF
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+UNITS = ([[r * 9 + c for c in range(9)] for r in range(9)] +
+         [[r * 9 + c for r in range(9)] for c in range(9)] +
+         [[(b // 3 * 3 + k // 3) * 9 + b % 3 * 3 + k % 3 for k in range(9)] for b in range(9)])
+
+def givens_clash(board):
+    """True if two givens of a 9x9 board repeat a digit in a row, column or
+    box. Such a board has no solution, but only solve_bitmask notices that
+    up front; dfs would backtrack through the whole search space."""
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for i, v in enumerate(v for row in board for v in row):
+        if v:
+            bit = 1 << (v - 1)
+            if (rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]]) & bit:
+                return True
+            rows[ROW_OF[i]] |= bit
+            cols[COL_OF[i]] |= bit
+            boxes[BOX_OF[i]] |= bit
+    return False
+
+def solve_bitmask(board, progress=None):
+    """Solves a 9x9 list-of-lists board (0 = empty) in place.
+
+    Returns (solved, nodes), nodes counting the digits tried at branch
+    points. progress(nodes, depth) is called every PROGRESS_INTERVAL nodes
+    and may raise SearchCancelled.
+    """
+    cells = [v for row in board for v in row]
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for i, v in enumerate(cells):
+        if v:
+            bit = 1 << (v - 1)
+            if (rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]]) & bit:
+                return False, 0  # the givens already clash
+            rows[ROW_OF[i]] |= bit
+            cols[COL_OF[i]] |= bit
+            boxes[BOX_OF[i]] |= bit
+    trail = []  # cells filled since the search started, for undo
+    nodes = 0
+
+    def candidates(i):
+        return ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+
+    def place(i, bit):
+        cells[i] = bit.bit_length()
+        rows[ROW_OF[i]] |= bit
+        cols[COL_OF[i]] |= bit
+        boxes[BOX_OF[i]] |= bit
+        trail.append(i)
+
+    def undo(mark):
+        while len(trail) > mark:
+            i = trail.pop()
+            keep = ~(1 << (cells[i] - 1))
+            cells[i] = 0
+            rows[ROW_OF[i]] &= keep
+            cols[COL_OF[i]] &= keep
+            boxes[BOX_OF[i]] &= keep
+
+    def propagate():
+        # False on a contradiction: a cell with no candidates, or a digit
+        # with nowhere left to go in some unit.
+        changed = True
+        while changed:
+            changed = False
+            for i in range(81):
+                if not cells[i]:
+                    mask = candidates(i)
+                    if not mask:
+                        return False
+                    if not mask & (mask - 1):
+                        place(i, mask)
+                        changed = True
+            for unit in UNITS:
+                once = twice = placed = 0
+                for i in unit:
+                    if cells[i]:
+                        placed |= 1 << (cells[i] - 1)
+                    else:
+                        mask = candidates(i)
+                        twice |= once & mask
+                        once |= mask
+                if once | placed != ALL_DIGITS:
+                    return False
+                hidden = once & ~twice
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in unit:
+                        if not cells[i] and candidates(i) & bit:
+                            place(i, bit)
+                            changed = True
+                            break
+                    else:
+                        return False  # an earlier single in this unit took its only cell
+        return True
+
+    def search(depth):
+        nonlocal nodes
+        if not propagate():
+            return False
+        best, best_mask, best_count = -1, 0, 10
+        for i in range(81):
+            if not cells[i]:
+                mask = candidates(i)
+                count = mask.bit_count()
+                if count < best_count:
+                    best, best_mask, best_count = i, mask, count
+                    if count == 2:
+                        break  # propagation leaves no singles, so 2 is the minimum
+        if best < 0:
+            return True
+        mark = len(trail)
+        while best_mask:
+            bit = best_mask & -best_mask
+            best_mask ^= bit
+            nodes += 1
+            if progress is not None and nodes % PROGRESS_INTERVAL == 0:
+                progress(nodes, depth)
+            place(best, bit)
+            if search(depth + 1):
+                return True
+            undo(mark)
+        return False
+
+    solved = search(0)
+    if solved:
+        for i, v in enumerate(cells):
+            board[i // 9][i % 9] = v
+    return solved, nodes
+
+# --- Dancing Links (Algorithm X) ---
+# Sudoku as exact cover: every candidate "digit d in cell (r, c)" is a row
+# covering four columns (cell filled, digit in row r, in column c, in the
+# box), and a solution picks rows covering each column exactly once. The
+# doubly linked node lists live in parallel flat lists indexed by node
+# number: node 0 is the root, 1..columns are the column headers. Works for
+# any N^2 x N^2 board.
+
+def solve_dlx(board, progress=None, limit=1):
+    """Solves an N^2 x N^2 list-of-lists board (0 = empty) in place.
+
+    Returns (solutions, nodes): solutions counts up to limit solutions (the
+    search stops there) and the board receives the first one. progress(nodes,
+    depth) is called every PROGRESS_INTERVAL nodes and may raise
+    SearchCancelled.
+    """
+    size = len(board)
+    box = math.isqrt(size)
+    if box * box != size or any(len(row) != size for row in board):
+        raise ValueError("Board must be N^2 x N^2")
+    cells = size * size
+    columns = 4 * cells
+    left = [columns] + list(range(columns))
+    right = list(range(1, columns + 1)) + [0]
+    up = list(range(columns + 1))
+    down = list(range(columns + 1))
+    column_of = list(range(columns + 1))
+    column_size = [0] * (columns + 1)
+    candidate_of = [-1] * (columns + 1)  # cell * size + digit - 1 for each node
+
+    def add_row(candidate, row_columns):
+        first = len(left)
+        last = first + len(row_columns) - 1
+        for node, col in enumerate(row_columns, first):
+            up.append(up[col])
+            down.append(col)
+            down[up[col]] = node
+            up[col] = node
+            column_of.append(col)
+            column_size[col] += 1
+            candidate_of.append(candidate)
+            left.append(node - 1 if node > first else last)
+            right.append(node + 1 if node < last else first)
+
+    # Only candidates consistent with the givens become rows; a given gets a
+    # single row, which the smallest-column rule then picks at once.
+    used = [0] * (3 * size)
+    for r in range(size):
+        for c in range(size):
+            if board[r][c]:
+                bit = 1 << board[r][c]
+                used[r] |= bit
+                used[size + c] |= bit
+                used[2 * size + r // box * box + c // box] |= bit
+    for r in range(size):
+        for c in range(size):
+            b = r // box * box + c // box
+            cell = r * size + c
+            taken = used[r] | used[size + c] | used[2 * size + b]
+            for digit in ([board[r][c]] if board[r][c] else range(1, size + 1)):
+                if board[r][c] or not taken & (1 << digit):
+                    d = digit - 1
+                    add_row(cell * size + d, (1 + cell, 1 + cells + r * size + d,
+                                              1 + 2 * cells + c * size + d, 1 + 3 * cells + b * size + d))
+
+    def cover(col):
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                column_size[column_of[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(col):
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                column_size[column_of[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    chosen = []
+    first_solution = []
+    solutions = nodes = 0
+
+    def search(depth):
+        # True once limit solutions are found; the links are left as they
+        # are then, since the structure is thrown away.
+        nonlocal solutions, nodes
+        if right[0] == 0:
+            solutions += 1
+            if solutions == 1:
+                first_solution.extend(chosen)
+            return solutions >= limit
+        col = best = right[0]
+        while col:
+            if column_size[col] < column_size[best]:
+                best = col
+                if column_size[col] < 2:
+                    break
+            col = right[col]
+        if not column_size[best]:
+            return False
+        cover(best)
+        row = down[best]
+        while row != best:
+            nodes += 1
+            if progress is not None and nodes % PROGRESS_INTERVAL == 0:
+                progress(nodes, depth)
+            chosen.append(row)
+            j = right[row]
+            while j != row:
+                cover(column_of[j])
+                j = right[j]
+            if search(depth + 1):
+                return True
+            j = left[row]
+            while j != row:
+                uncover(column_of[j])
+                j = left[j]
+            chosen.pop()
+            row = down[row]
+        uncover(best)
+        return False
+
+    search(0)
+    for node in first_solution:
+        cell, d = divmod(candidate_of[node], size)
+        board[cell // size][cell % size] = d + 1
+    return solutions, nodes
+
+def count_solutions(board, limit=2):
+    """Number of solutions, counting no further than limit; the board is left as is."""
+    return solve_dlx([row[:] for row in board], limit=limit)[0]
+
+# --- Best-first search ---
+# States are 81-byte bytes objects (0 = empty): a child shares nothing
+# mutable with its parent, so building one is a single slice-and-join. The
+# heuristic is the number of empty cells, which drops by exactly one per
+# move, so children get parent - 1 without rescanning. Heap entries carry an
+# insertion counter so equal scores never fall back to comparing boards.
+
+ASTAR_MAX_NODES = 500_000  # expansions before giving up
+ASTAR_MAX_STATES = 2_000_000  # heap entries plus visited keys; roughly 200 bytes each
+DIGIT_BYTES = [bytes((d,)) for d in range(10)]
+
+def solve_astar(board, progress=None, max_nodes=ASTAR_MAX_NODES, max_states=ASTAR_MAX_STATES):
+    """Best-first search on empty-cell count; solves a 9x9 board in place.
+
+    Branches on the cell with the fewest candidates. Returns (solved,
+    nodes). progress(nodes, frontier) is called every PROGRESS_INTERVAL
+    expansions and may raise SearchCancelled; SearchLimitExceeded is raised
+    once max_nodes expansions or max_states stored states are reached.
+    """
+    state = bytes(v for row in board for v in row)
+    heap = [(state.count(0), 0, state)]
+    visited = set()  # hash(state): 8 bytes of key instead of an 81-byte board
+    counter = 1
+    nodes = 0
+
+    while heap:
+        empty, _, current = heapq.heappop(heap)
+        key = hash(current)
+        if key in visited:
+            continue
+        visited.add(key)
+        nodes += 1
+        if progress is not None and nodes % PROGRESS_INTERVAL == 0:
+            progress(nodes, len(heap))
+        if nodes > max_nodes or len(heap) + len(visited) > max_states:
+            raise SearchLimitExceeded(f"gave up after {nodes} nodes, {len(heap) + len(visited)} states")
+
+        rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+        for i, v in enumerate(current):
+            if v:
+                bit = 1 << (v - 1)
+                if (rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]]) & bit:
+                    return False, nodes  # only the givens can clash
+                rows[ROW_OF[i]] |= bit
+                cols[COL_OF[i]] |= bit
+                boxes[BOX_OF[i]] |= bit
+        if not empty:
+            for i, v in enumerate(current):
+                board[i // 9][i % 9] = v
+            return True, nodes
+
+        best, best_mask, best_count = -1, 0, 10
+        for i, v in enumerate(current):
+            if not v:
+                mask = ALL_DIGITS & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+                count = mask.bit_count()
+                if count < best_count:
+                    best, best_mask, best_count = i, mask, count
+                    if count < 2:
+                        break
+        prefix, suffix = current[:best], current[best + 1:]
+        while best_mask:
+            bit = best_mask & -best_mask
+            best_mask ^= bit
+            heapq.heappush(heap, (empty - 1, counter, prefix + DIGIT_BYTES[bit.bit_length()] + suffix))
+            counter += 1
+
+    return False, nodes
+
+# --- Puzzle format ---
+
+HARD_PUZZLES = {
+    "Arto Inkala 2012": "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "Easter Monster": "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1",
+    "AI Escargot": "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "17 clues": "...8.1..........435............7.8........1...2..3....6......75..34........2..6..",
+}
+
+def parse_puzzle(text):
+    """81 characters, digits for givens and '.' or '0' for blanks. Raises
+    ValueError for anything else, and for givens that already clash."""
+    if len(text) != 81 or any(ch not in ".0123456789" for ch in text):
+        raise ValueError("Expected 81 characters of digits and '.'")
+    board = [[0 if ch in ".0" else int(ch) for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
+    if givens_clash(board):
+        raise ValueError("Givens repeat a digit in a row, column or box")
+    return board
+
+def format_puzzle(board):
+    return "".join(str(v) if v else "." for row in board for v in row)
+
+SOLVERS = {"bitmask": solve_bitmask, "dlx": solve_dlx, "astar": solve_astar, "dfs": solve_dfs}
+
+def solve(board, algorithm="bitmask", progress=None):
+    """Runs one of SOLVERS on board; returns (solved, nodes). Boards whose
+    givens clash are unsolvable and return (False, 0) without a search."""
+    if givens_clash(board):
+        return False, 0
+    solved, nodes = SOLVERS[algorithm](board, progress)
+    return bool(solved), nodes
+
+# --- Batch solving ---
+# Same scheme as the 8-puzzle batch mode (SearchRunner.run_batch): one JSON
+# line per puzzle, in completion order, with "line" for the input position.
+
+def solve_chunk(puzzles, algorithm="bitmask", count=False):
+    """Solves a list of (line number, puzzle text) pairs; returns their result dicts."""
+    results = []
+    for number, text in puzzles:
+        result = {"line": number, "puzzle": text}
+        try:
+            board = parse_puzzle(text)
+        except ValueError as error:
+            result["error"] = str(error)
+            results.append(result)
+            continue
+        if count:
+            result["solutions"] = count_solutions(board)
+        start_time = time.perf_counter()
+        try:
+            solved, nodes = solve(board, algorithm)
+        except SearchLimitExceeded as error:
+            result["error"] = str(error)
+        else:
+            result["solution"] = format_puzzle(board) if solved else None
+            result["nodes"] = nodes
+        result["time_ms"] = round(1000 * (time.perf_counter() - start_time), 3)
+        results.append(result)
+    return results
+
+def solve_batch(lines, out, workers=None, chunk_size=64, algorithm="bitmask", count=False):
+    run_batch(solve_chunk, lines, out, workers, chunk_size, algorithm, count)
+
+# --- Benchmark ---
+
+def percentile(values, fraction):
+    # Nearest-rank percentile; values must be sorted.
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def benchmark(puzzles, algorithms=("bitmask", "dlx"), repeats=1):
+    """Per algorithm: puzzles/sec and per-puzzle latency percentiles, one process.
+    Malformed puzzles are skipped and counted."""
+    boards = []
+    for text in puzzles:
+        try:
+            boards.append(parse_puzzle(text))
+        except ValueError:
+            pass
+    if len(boards) < len(puzzles):
+        print(f"skipped {len(puzzles) - len(boards)} malformed puzzles")
+    if not boards:
+        return
+    for algorithm in algorithms:
+        latencies = []
+        failures = 0
+        for _ in range(repeats):
+            for board in boards:
+                board = [row[:] for row in board]
+                start_time = time.perf_counter()
+                try:
+                    solved, _ = solve(board, algorithm)
+                except SearchLimitExceeded:
+                    solved = False
+                latencies.append(time.perf_counter() - start_time)
+                failures += not solved
+        total = sum(latencies)
+        latencies.sort()
+        print(f"{algorithm:>8}: {len(latencies) / total:.1f} puzzles/s, "
+              f"p50={1000 * percentile(latencies, 0.5):.2f}ms, p90={1000 * percentile(latencies, 0.9):.2f}ms, "
+              f"p99={1000 * percentile(latencies, 0.99):.2f}ms, max={1000 * latencies[-1]:.2f}ms"
+              + (f", {failures} unsolved" if failures else ""))
+
+def read_puzzles(path):
+    with open(path) as f:
+        return [text for _, text in read_entries(f)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Sudoku puzzles given one per line as 81 characters.")
+    parser.add_argument("--batch", metavar="FILE", help="solve every puzzle in FILE ('-' for stdin) and print JSON lines")
+    parser.add_argument("--workers", type=int, help="worker processes for --batch (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="puzzles per task for --batch")
+    parser.add_argument("--algorithm", choices=list(SOLVERS), default="bitmask", help="solver used by --batch")
+    parser.add_argument("--count", action="store_true", help="also report the solution count (capped at 2) per puzzle")
+    parser.add_argument("--bench", nargs="*", metavar="FILE",
+                        help="report puzzles/sec and latency percentiles on the given corpora (default: built-in hard puzzles)")
+    parser.add_argument("--algorithms", nargs="+", choices=list(SOLVERS), default=["bitmask", "dlx"],
+                        help="solvers compared by --bench")
+    parser.add_argument("--repeats", type=int, default=1, help="passes over each corpus for --bench")
+    args = parser.parse_args()
+    if args.batch:
+        if args.batch == "-":
+            solve_batch(sys.stdin, sys.stdout, args.workers, args.chunk_size, args.algorithm, args.count)
+        else:
+            with open(args.batch) as f:
+                solve_batch(f, sys.stdout, args.workers, args.chunk_size, args.algorithm, args.count)
+    elif args.bench is not None:
+        corpora = {path: read_puzzles(path) for path in args.bench} or {"hard puzzles": list(HARD_PUZZLES.values())}
+        for name, puzzles in corpora.items():
+            print(f"{name}: {len(puzzles)} puzzles")
+            benchmark(puzzles, args.algorithms, args.repeats)
+    else:
+        parser.print_help()
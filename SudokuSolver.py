@@ -1,16 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import time
-import heapq
-import copy
+import sys
+
+from SearchRunner import SearchCancelled, SearchWorker
+from SudokuEngine import HARD_PUZZLES, SearchLimitExceeded, benchmark, solve
+
+POLL_MS = 50
+DIGITS = "123456789"
+ALGORITHMS = {"Bitmask": "bitmask", "DFS": "dfs", "A*": "astar", "DLX": "dlx"}  # combobox label -> SudokuEngine solver
+# A* reports its heap size with progress; the backtracking solvers report depth.
 
 class SudokuGUI:
     def __init__(self, root):
         self.root = root
-        self.root.title("Sudoku Solver: DFS vs A*")
+        self.root.title("Sudoku Solver: Bitmask, DFS, A* & DLX")
         self.entries = [[None for _ in range(9)] for _ in range(9)]
-        self.algorithm = tk.StringVar(value="DFS")
-        self.nodes_explored = 0
+        self.algorithm = tk.StringVar(value="Bitmask")
+        self.search = SearchWorker()
+        self.search_algorithm = None
         self.setup_board()
         self.setup_controls()
 
@@ -23,22 +30,29 @@ class SudokuGUI:
 
     def setup_controls(self):
         ttk.Label(self.root, text="Algorithm:").grid(row=9, column=0)
-        algo_menu = ttk.Combobox(self.root, textvariable=self.algorithm, values=["DFS", "A*"], width=10)
+        algo_menu = ttk.Combobox(self.root, textvariable=self.algorithm, values=list(ALGORITHMS), width=10, state="readonly")
         algo_menu.grid(row=9, column=1, columnspan=2)
 
-        tk.Button(self.root, text="Solve", command=self.solve, bg='green', fg='white').grid(row=9, column=3, columnspan=2)
+        self.solve_btn = tk.Button(self.root, text="Solve", command=self.solve, bg='green', fg='white')
+        self.solve_btn.grid(row=9, column=3, columnspan=2)
         tk.Button(self.root, text="Clear", command=self.clear, bg='red', fg='white').grid(row=9, column=5, columnspan=2)
+        self.cancel_btn = tk.Button(self.root, text="Cancel", command=self.search.cancel, state=tk.DISABLED)
+        self.cancel_btn.grid(row=9, column=7, columnspan=2)
 
         self.status = ttk.Label(self.root, text="")
         self.status.grid(row=10, column=0, columnspan=9, pady=10)
 
     def read_board(self):
+        # Blank cells are 0; anything but a single digit 1-9 is an input
+        # error, since the solvers are only defined for those values.
         board = []
         for i in range(9):
             row = []
             for j in range(9):
-                val = self.entries[i][j].get()
-                row.append(int(val) if val.isdigit() else 0)
+                val = self.entries[i][j].get().strip()
+                if val and (len(val) != 1 or val not in DIGITS):
+                    raise ValueError(f"Row {i + 1}, column {j + 1}: enter a digit from 1 to 9 or leave the cell empty.")
+                row.append(int(val) if val else 0)
             board.append(row)
         return board
 
@@ -56,88 +70,56 @@ class SudokuGUI:
         self.status.config(text="")
 
     def solve(self):
-        board = self.read_board()
-        self.nodes_explored = 0
-        start = time.time()
-
-        if self.algorithm.get() == "DFS":
-            solved = self.solve_dfs(board)
-        else:
-            solved = self.solve_astar(board)
-
-        end = time.time()
+        if self.search.busy:
+            return
+        try:
+            board = self.read_board()
+        except ValueError as error:
+            messagebox.showerror("Invalid input", str(error))
+            return
+        self.search_algorithm = self.algorithm.get()
+        self.search.start(self.run_search, self.search_algorithm, board)
+        self.solve_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.root.after(POLL_MS, self.poll)
+
+    def run_search(self, progress, algorithm, board):
+        solved, nodes_explored = solve(board, ALGORITHMS[algorithm], progress)
+        return board, solved, nodes_explored
+
+    def poll(self):
+        nodes, frontier = self.search.progress
+        if self.search.running:
+            label = "Frontier" if ALGORITHMS[self.search_algorithm] == "astar" else "Depth"
+            self.status.config(text=f"Searching... Nodes: {nodes} | {label}: {frontier}")
+            self.root.after(POLL_MS, self.poll)
+            return
+        self.solve_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        algorithm = self.search_algorithm
+        try:
+            board, solved, nodes = self.search.collect()
+        except SearchCancelled:
+            self.status.config(text=f"{algorithm} cancelled | Nodes: {nodes}")
+            return
+        except SearchLimitExceeded as error:
+            self.status.config(text=f"{algorithm} {error} | Nodes: {nodes}")
+            return
+        except Exception as error:
+            self.status.config(text=f"{algorithm} failed: {error!r}")
+            return
         if solved:
             self.write_board(board)
-            self.status.config(text=f"✅ {self.algorithm.get()} | Nodes: {self.nodes_explored} | Time: {end - start:.4f}s")
+            self.status.config(text=f"✅ {algorithm} | Nodes: {nodes} | Time: {self.search.elapsed:.4f}s")
         else:
+            self.status.config(text="")
             messagebox.showerror("Unsolvable", "No solution found.")
 
-    def is_valid(self, board, row, col, num):
-        for i in range(9):
-            if board[row][i] == num or board[i][col] == num:
-                return False
-        r, c = 3 * (row//3), 3 * (col//3)
-        for i in range(r, r+3):
-            for j in range(c, c+3):
-                if board[i][j] == num:
-                    return False
-        return True
-
-    def solve_dfs(self, board):
-        for i in range(9):
-            for j in range(9):
-                if board[i][j] == 0:
-                    for num in range(1, 10):
-                        self.nodes_explored += 1
-                        if self.is_valid(board, i, j, num):
-                            board[i][j] = num
-                            if self.solve_dfs(board):
-                                return True
-                            board[i][j] = 0
-                    return False
-        return True
-
-    def solve_astar(self, board):
-        def heuristic(b):
-            return sum(row.count(0) for row in b)
-
-        def next_states(b):
-            for i in range(9):
-                for j in range(9):
-                    if b[i][j] == 0:
-                        for num in range(1, 10):
-                            if self.is_valid(b, i, j, num):
-                                new_board = copy.deepcopy(b)
-                                new_board[i][j] = num
-                                yield new_board
-                        return
-
-        heap = []
-        h = heuristic(board)
-        heapq.heappush(heap, (h, board))
-
-        visited = set()
-
-        while heap:
-            _, current = heapq.heappop(heap)
-            self.nodes_explored += 1
-
-            state_key = str(current)
-            if state_key in visited:
-                continue
-            visited.add(state_key)
-
-            if heuristic(current) == 0:
-                board[:] = current
-                return True
-
-            for child in next_states(current):
-                heapq.heappush(heap, (heuristic(child), child))
-
-        return False
-
 # Run
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark(list(HARD_PUZZLES.values()), ["bitmask", "dlx", "astar"])
+        sys.exit()
     root = tk.Tk()
     app = SudokuGUI(root)
     root.mainloop()
@@ -1,5 +1,11 @@
-import copy
+import argparse
 import heapq
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Constants
 PLAYER = 'X'
@@ -10,7 +16,55 @@ def print_board(board):
     print("\n".join([" | ".join(row) for row in board]))
     print()
 
+# --- Bitboard core ---
+# A position is two 9-bit ints, one per player, with bit r * 3 + c set for
+# cell (r, c). A win is one AND per line mask, the empty cells are
+# FULL & ~(x | o), and moves come off that set lowest bit first (the same
+# row-major order the list code used). The list-of-lists functions below are
+# thin adapters over it.
+
+FULL = 0x1FF
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+WIN_MASKS = [(1 << a) | (1 << b) | (1 << c) for a, b, c in LINES]
+
+def to_bits(board):
+    """Returns (x, o): the PLAYER and AI bitboards of a list-of-lists board."""
+    x = o = 0
+    for i in range(9):
+        cell = board[i // 3][i % 3]
+        if cell == PLAYER:
+            x |= 1 << i
+        elif cell == AI:
+            o |= 1 << i
+    return x, o
+
+def to_board(x, o, rows=3, cols=3):
+    return [[PLAYER if x >> (r * cols + c) & 1 else AI if o >> (r * cols + c) & 1 else EMPTY for c in range(cols)]
+            for r in range(rows)]
+
+def has_won(bits, masks=WIN_MASKS):
+    for mask in masks:
+        if bits & mask == mask:
+            return True
+    return False
+
+def evaluate(x, o):
+    # heuristic() on bitboards.
+    if has_won(x):
+        return 10
+    if has_won(o):
+        return -10
+    return 0
+
+def bit_move(bit):
+    return divmod(bit.bit_length() - 1, 3)
+
 def check_winner(board):
+    x, o = to_bits(board)
+    return PLAYER if has_won(x) else AI if has_won(o) else None
+
+def check_winner_reference(board):
+    # The original list-based check, kept as the benchmark baseline.
     lines = []
 
     for row in board:
@@ -26,125 +80,735 @@ def check_winner(board):
     return None
 
 def is_full(board):
-    return all(cell != EMPTY for row in board for cell in row)
+    x, o = to_bits(board)
+    return x | o == FULL
 
 def get_available_moves(board):
-    return [(i, j) for i in range(3) for j in range(3) if board[i][j] == EMPTY]
+    x, o = to_bits(board)
+    return [divmod(i, 3) for i in range(9) if not (x | o) >> i & 1]
 
 def heuristic(board):
-    winner = check_winner(board)
-    if winner == AI:
-        return -10
-    elif winner == PLAYER:
-        return 10
-    else:
-        return 0
+    return evaluate(*to_bits(board))
 
 # --- DFS Implementation ---
 
-def dfs(board, player):
-    winner = check_winner(board)
-    if winner or is_full(board):
-        return heuristic(board), None
+def dfs(board, player, stats=None):
+    score, bit = minimax_bits(*to_bits(board), player == AI, stats)
+    return score, None if bit is None else bit_move(bit)
 
-    if player == AI:
+def minimax_bits(x, o, ai_turn, stats=None):
+    """Plain minimax on bitboards: (score, move bit or None)."""
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + 1
+    if has_won(x):
+        return 10, None
+    if has_won(o):
+        return -10, None
+    free = FULL & ~(x | o)
+    if not free:
+        return 0, None
+
+    best_bit = None
+    if ai_turn:
         best = float('inf')
-        best_move = None
-        for move in get_available_moves(board):
-            i, j = move
-            new_board = copy.deepcopy(board)
-            new_board[i][j] = AI
-            score, _ = dfs(new_board, PLAYER)
+        while free:
+            bit = free & -free
+            free ^= bit
+            score, _ = minimax_bits(x, o | bit, False, stats)
             if score < best:
                 best = score
-                best_move = move
-        return best, best_move
+                best_bit = bit
     else:
         best = float('-inf')
-        best_move = None
-        for move in get_available_moves(board):
-            i, j = move
-            new_board = copy.deepcopy(board)
-            new_board[i][j] = PLAYER
-            score, _ = dfs(new_board, AI)
+        while free:
+            bit = free & -free
+            free ^= bit
+            score, _ = minimax_bits(x | bit, o, True, stats)
             if score > best:
                 best = score
-                best_move = move
-        return best, best_move
+                best_bit = bit
+    return best, best_bit
+
+# --- Alpha-beta with a transposition table ---
+# Same scores as dfs (from PLAYER's side: +10 win, -10 loss, 0 draw), but on
+# a flat 9-cell list where moves are made and undone in place. Positions are
+# stored under the smallest of their 8 rotations/reflections, so symmetric
+# positions share one table entry.
+
+SYMMETRIES = [
+    (0, 1, 2, 3, 4, 5, 6, 7, 8), (6, 3, 0, 7, 4, 1, 8, 5, 2), (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6), (2, 1, 0, 5, 4, 3, 8, 7, 6), (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8), (8, 5, 2, 7, 4, 1, 6, 3, 0),
+]
+LINES_THROUGH = [[line for line in LINES if cell in line] for cell in range(9)]
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]  # center, corners, edges
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class AlphaBeta:
+    """Minimax with alpha-beta pruning and a symmetry-reduced transposition table.
+
+    The table keeps exact values and fail-soft lower/upper bounds; it is
+    kept between calls, so one instance per game turns later moves into
+    lookups. nodes counts positions visited by the last best_move call.
+    """
+
+    def __init__(self):
+        self.table = {}
+        self.nodes = 0
+
+    def best_move(self, board, player):
+        """Returns (score, (row, col)) like dfs; the move is None if the game is over."""
+        if check_winner(board) or is_full(board):
+            return heuristic(board), None
+        cells = [cell for row in board for cell in row]
+        self.nodes = 0
+        maximizing = player == PLAYER
+        other = AI if maximizing else PLAYER
+        alpha, beta = float('-inf'), float('inf')
+        best_score, best_move = None, None
+        for move in MOVE_ORDER:
+            if cells[move] != EMPTY:
+                continue
+            cells[move] = player
+            score = self.search(cells, other, move, alpha, beta)
+            cells[move] = EMPTY
+            if best_move is None or (score > best_score if maximizing else score < best_score):
+                best_score, best_move = score, move
+                if maximizing:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+        return best_score, divmod(best_move, 3)
+
+    def search(self, cells, player, last, alpha, beta):
+        # Value of the position after `last` was played, `player` to move.
+        self.nodes += 1
+        mark = cells[last]
+        for a, b, c in LINES_THROUGH[last]:
+            if cells[a] == cells[b] == cells[c] == mark:
+                return 10 if mark == PLAYER else -10
+        if EMPTY not in cells:
+            return 0
+
+        key = min("".join([cells[i] for i in symmetry]) for symmetry in SYMMETRIES) + player
+        entry = self.table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha, original_beta = alpha, beta
+        maximizing = player == PLAYER
+        other = AI if maximizing else PLAYER
+        best = float('-inf') if maximizing else float('inf')
+        for move in MOVE_ORDER:
+            if cells[move] != EMPTY:
+                continue
+            cells[move] = player
+            value = self.search(cells, other, move, alpha, beta)
+            cells[move] = EMPTY
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = min(best, value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= original_beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (best, flag)
+        return best
 
 # --- A* Implementation ---
 
+# Cell weights that make `rank` order positions the way the old list-of-lists
+# boards compared (row-major, EMPTY < AI < PLAYER), so ties break as before.
+RANK_WEIGHTS = [3 ** (8 - i) for i in range(9)]
+
 def a_star(board):
+    x, o = to_bits(board)
+    rank = sum(RANK_WEIGHTS[i] * (2 if x >> i & 1 else 1 if o >> i & 1 else 0) for i in range(9))
     pq = []
-    heapq.heappush(pq, (heuristic(board), board, True, None)) 
+    heapq.heappush(pq, (evaluate(x, o), rank, True, None, x, o))
 
     visited = set()
 
     while pq:
-        _, current, is_ai_turn, move_to_reach = heapq.heappop(pq)
-        key = str(current)
-        if key in visited:
+        _, rank, is_ai_turn, move_to_reach, x, o = heapq.heappop(pq)
+        if (x, o) in visited:
             continue
-        visited.add(key)
+        visited.add((x, o))
 
-        winner = check_winner(current)
-        if winner or is_full(current):
-            return heuristic(current), move_to_reach
+        score = evaluate(x, o)
+        if score or x | o == FULL:
+            return score, move_to_reach
 
-        for move in get_available_moves(current):
-            i, j = move
-            new_board = copy.deepcopy(current)
-            new_board[i][j] = AI if is_ai_turn else PLAYER
-            score = heuristic(new_board)
-            heapq.heappush(pq, (score, new_board, not is_ai_turn, move if move_to_reach is None else move_to_reach))
+        free = FULL & ~(x | o)
+        while free:
+            bit = free & -free
+            free ^= bit
+            i = bit.bit_length() - 1
+            move = divmod(i, 3)
+            first_move = move if move_to_reach is None else move_to_reach
+            if is_ai_turn:
+                child = (x, o | bit, rank + RANK_WEIGHTS[i])
+            else:
+                child = (x | bit, o, rank + 2 * RANK_WEIGHTS[i])
+            heapq.heappush(pq, (evaluate(child[0], child[1]), child[2], not is_ai_turn, first_move, child[0], child[1]))
 
     return 0, None
 
+# --- m,n,k engine: iterative-deepening alpha-beta ---
+# For boards where full-depth search can't finish (4x4, 7x7 with k=4, ...).
+# Each k-cell window keeps a stone count per player, updated when a move is
+# made or undone. That gives the win test (a count reaching k) and an
+# open-line evaluation: a window holding only one player's stones is worth
+# LINE_WEIGHTS[count] to that player. Iterative deepening runs negamax with
+# a transposition table, killer and history move ordering, and gives up
+# mid-iteration once the per-move budget is spent, falling back to the best
+# move of the last finished depth.
+
+WIN = 1_000_000
+NEAR_RADIUS = 2  # moves considered: empty cells this close to a stone (or k - 1, if less)
+
+class SearchTimeout(Exception):
+    pass
+
+def line_masks(rows, cols, k):
+    """Bitmasks of every k-in-a-row window on a rows x cols board (bit r * cols + c)."""
+    masks = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                if 0 <= r + dr * (k - 1) < rows and 0 <= c + dc * (k - 1) < cols:
+                    masks.append(sum(1 << ((r + dr * i) * cols + c + dc * i) for i in range(k)))
+    return masks
+
+def near_masks(rows, cols, radius):
+    """For each cell, the bitmask of cells within `radius` rows and columns of it."""
+    masks = []
+    for cell in range(rows * cols):
+        r, c = divmod(cell, cols)
+        masks.append(sum(1 << (rr * cols + cc)
+                         for rr in range(max(0, r - radius), min(rows, r + radius + 1))
+                         for cc in range(max(0, c - radius), min(cols, c + radius + 1))))
+    return masks
+
+class MNKEngine:
+    """Best moves for an m,n,k-game within a time budget per move.
+
+    best_move takes a list-of-lists board of any size and returns
+    (score, (row, col)) with the score from PLAYER's side like dfs, but on a
+    larger scale: +-WIN for a forced result, open-line totals otherwise.
+    depth, nodes and elapsed describe the last call.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, budget=0.2):
+        self.rows, self.cols, self.k, self.budget = rows, cols, k, budget
+        self.cells = rows * cols
+        self.windows = line_masks(rows, cols, k)
+        self.cell_windows = [[w for w, mask in enumerate(self.windows) if mask >> cell & 1]
+                             for cell in range(self.cells)]
+        self.near = near_masks(rows, cols, min(NEAR_RADIUS, k - 1))
+        self.weights = [0] + [4 ** i for i in range(1, k)] + [WIN]
+        self.table = {}  # (x, o) -> (depth, value, flag, move), kept across calls
+        self.history = [0] * self.cells
+        self.depth = self.nodes = 0
+        self.elapsed = 0.0
+
+    def best_move(self, board, player):
+        x, o = 0, 0
+        for r, row in enumerate(board):
+            for c, cell in enumerate(row):
+                if cell == PLAYER:
+                    x |= 1 << (r * self.cols + c)
+                elif cell == AI:
+                    o |= 1 << (r * self.cols + c)
+        self.setup(x, o)
+        side = 0 if player == PLAYER else 1
+        sign = 1 if side == 0 else -1
+        start = time.perf_counter()
+        self.deadline = start + self.budget
+        self.nodes = self.depth = 0
+        self.killers = [[None, None] for _ in range(self.cells + 1)]
+        self.history = [h // 2 for h in self.history]
+        if len(self.table) > 1_000_000:
+            self.table.clear()
+
+        moves = self.candidates(0, None)
+        if self.won or not moves:
+            self.elapsed = time.perf_counter() - start
+            return (self.score if self.won else 0), None
+        best_score, best = 0, moves[0]
+        for depth in range(1, self.cells - bin(x | o).count("1") + 1):
+            try:
+                score, move = self.root(depth, side, best)
+            except SearchTimeout:
+                break
+            best_score, best, self.depth = score, move, depth
+            if abs(score) > WIN // 2:  # forced win or loss found
+                break
+        self.elapsed = time.perf_counter() - start
+        return sign * best_score, divmod(best, self.cols)
+
+    def setup(self, x, o):
+        self.bits = [x, o]
+        self.counts = [[(x & mask).bit_count() for mask in self.windows],
+                       [(o & mask).bit_count() for mask in self.windows]]
+        self.won = any(count >= self.k for counts in self.counts for count in counts)
+        self.score = sum(self.line_value(xs, os) for xs, os in zip(*self.counts))
+
+    def line_value(self, xs, os):
+        # A window's contribution to the score, from PLAYER's side.
+        if xs and os:
+            return 0
+        return self.weights[xs] if xs else -self.weights[os]
+
+    def make(self, cell, side):
+        # Places a stone and returns True if it completes a line.
+        self.bits[side] |= 1 << cell
+        mine, theirs = self.counts[side], self.counts[1 - side]
+        weights = self.weights
+        delta = 0
+        won = False
+        for w in self.cell_windows[cell]:
+            count = mine[w]
+            mine[w] = count + 1
+            if not theirs[w]:
+                delta += weights[count + 1] - weights[count]
+                if count + 1 == self.k:
+                    won = True
+            elif not count:
+                delta += weights[theirs[w]]  # the window was theirs; now it is dead
+        self.score += delta if side == 0 else -delta
+        return won
+
+    def unmake(self, cell, side):
+        self.bits[side] &= ~(1 << cell)
+        mine, theirs = self.counts[side], self.counts[1 - side]
+        weights = self.weights
+        delta = 0
+        for w in self.cell_windows[cell]:
+            count = mine[w] - 1
+            mine[w] = count
+            if not theirs[w]:
+                delta += weights[count + 1] - weights[count]
+            elif not count:
+                delta += weights[theirs[w]]
+        self.score -= delta if side == 0 else -delta
+
+    def candidates(self, ply, first):
+        # Empty cells near a stone (the centre on an empty board), ordered
+        # by the table move, this ply's killers, then history.
+        occupied = self.bits[0] | self.bits[1]
+        if not occupied:
+            return [(self.rows // 2) * self.cols + self.cols // 2]
+        near = self.near
+        moves = [cell for cell in range(self.cells) if not occupied >> cell & 1 and near[cell] & occupied]
+        moves.sort(key=self.history.__getitem__, reverse=True)
+        for cell in reversed(self.killers[ply]):
+            if cell in moves:
+                moves.remove(cell)
+                moves.insert(0, cell)
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def root(self, depth, side, first):
+        alpha, beta = -WIN - 1, WIN + 1
+        best_move = None
+        for cell in self.candidates(0, first):
+            if self.make(cell, side):
+                value = WIN
+            else:
+                value = -self.negamax(depth - 1, -beta, -alpha, 1, 1 - side)
+            self.unmake(cell, side)
+            if best_move is None or value > alpha:
+                alpha, best_move = value, cell
+        return alpha, best_move
+
+    def negamax(self, depth, alpha, beta, ply, side):
+        self.nodes += 1
+        if not self.nodes & 255 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        if depth == 0:
+            return self.score if side == 0 else -self.score
+
+        # Forced results are stored relative to this node so they stay
+        # correct when the position turns up at another ply.
+        key = (self.bits[0], self.bits[1])
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            entry_depth, value, flag, first = entry
+            if entry_depth >= depth:
+                if value > WIN // 2:
+                    value -= ply
+                elif value < -WIN // 2:
+                    value += ply
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta or flag == UPPER and value <= alpha:
+                    return value
+
+        moves = self.candidates(ply, first)
+        if not moves:
+            return 0
+        original_alpha = alpha
+        best, best_move = -WIN - 1, None
+        for cell in moves:
+            if self.make(cell, side):
+                value = WIN - ply
+            else:
+                value = -self.negamax(depth - 1, -beta, -alpha, ply + 1, 1 - side)
+            self.unmake(cell, side)
+            if value > best:
+                best, best_move = value, cell
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        killers = self.killers[ply]
+                        if killers[0] != cell:
+                            killers[0], killers[1] = cell, killers[0]
+                        self.history[cell] += depth * depth
+                        break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        stored = best + ply if best > WIN // 2 else best - ply if best < -WIN // 2 else best
+        self.table[key] = (depth, stored, flag, best_move)
+        return best
+
+# --- Monte Carlo tree search ---
+# UCT on the same bitboards, with uniformly random playouts: the empty cells
+# are shuffled once and filled in that order, checking only the windows
+# through each new stone. For parallelism each worker process grows its own
+# tree from the same position (root parallelization), and the root children's
+# visit and win counts are summed across workers before choosing the most
+# visited move. As in MNKEngine, tree moves are limited to cells near a stone.
+
+UCT_C = 1.4
+
+class MCTSNode:
+    __slots__ = ("cell", "side", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, cell, side, parent, untried):
+        self.cell = cell
+        self.side = side  # who played `cell`
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0  # for the side that played `cell`; draws count half
+
+def mcts_search(rows, cols, k, x, o, side, iterations=None, seconds=1.0, seed=None):
+    """Grows one UCT tree for `side` (0 = PLAYER, 1 = AI) to move.
+
+    Stops after `iterations` playouts or, if that is None, after `seconds`.
+    Returns ({cell: (visits, wins)} for the root's children, playouts).
+    """
+    rng = random.Random(seed)
+    cells = rows * cols
+    cell_masks = [[mask for mask in line_masks(rows, cols, k) if mask >> cell & 1] for cell in range(cells)]
+    near = near_masks(rows, cols, min(NEAR_RADIUS, k - 1))
+
+    def tree_moves(bits):
+        occupied = bits[0] | bits[1]
+        if not occupied:
+            return [(rows // 2) * cols + cols // 2]
+        moves = [cell for cell in range(cells) if not occupied >> cell & 1 and near[cell] & occupied]
+        rng.shuffle(moves)
+        return moves
+
+    def wins_with(stones, cell):
+        for mask in cell_masks[cell]:
+            if stones & mask == mask:
+                return True
+        return False
+
+    root = MCTSNode(None, 1 - side, None, tree_moves([x, o]))
+    deadline = time.perf_counter() + seconds
+    playouts = 0
+    while (playouts < iterations) if iterations is not None else (time.perf_counter() < deadline):
+        playouts += 1
+        bits = [x, o]
+        turn = side
+        node = root
+        winner = None
+
+        # Selection: descend through fully expanded nodes by UCT.
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + UCT_C * math.sqrt(log_visits / child.visits))
+            bits[turn] |= 1 << node.cell
+            if wins_with(bits[turn], node.cell):
+                winner = turn
+            turn = 1 - turn
+
+        # Expansion: one untried move, unless the game is already over.
+        if winner is None and node.untried:
+            cell = node.untried.pop()
+            bits[turn] |= 1 << cell
+            if wins_with(bits[turn], cell):
+                winner = turn
+                child = MCTSNode(cell, turn, node, [])
+            else:
+                child = MCTSNode(cell, turn, node, tree_moves(bits))
+            node.children.append(child)
+            node = child
+            turn = 1 - turn
+
+        # Playout: fill the remaining cells in random order.
+        if winner is None:
+            occupied = bits[0] | bits[1]
+            empty = [cell for cell in range(cells) if not occupied >> cell & 1]
+            rng.shuffle(empty)
+            for cell in empty:
+                bits[turn] |= 1 << cell
+                if wins_with(bits[turn], cell):
+                    winner = turn
+                    break
+                turn = 1 - turn
+
+        # Backpropagation: each node scores the result for the side that moved into it.
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.side:
+                node.wins += 1
+            node = node.parent
+    return {child.cell: (child.visits, child.wins) for child in root.children}, playouts
+
+class MCTSPlayer:
+    """Root-parallel MCTS over `workers` processes.
+
+    With `iterations` set, the playouts are split evenly between workers;
+    otherwise every worker searches for `budget` seconds. best_move returns
+    (win rate for `player`, (row, col)); playouts and elapsed describe the
+    last call. The pool lives until close().
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, budget=1.0, iterations=None, workers=None, seed=None):
+        self.rows, self.cols, self.k = rows, cols, k
+        self.budget, self.iterations = budget, iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.pool = None
+        self.playouts = 0
+        self.elapsed = 0.0
+
+    def best_move(self, board, player):
+        x, o = 0, 0
+        for r, row in enumerate(board):
+            for c, cell in enumerate(row):
+                if cell == PLAYER:
+                    x |= 1 << (r * self.cols + c)
+                elif cell == AI:
+                    o |= 1 << (r * self.cols + c)
+        side = 0 if player == PLAYER else 1
+        iterations = None if self.iterations is None else -(-self.iterations // self.workers)
+        jobs = [(self.rows, self.cols, self.k, x, o, side, iterations, self.budget, self.rng.getrandbits(32))
+                for _ in range(self.workers)]
+
+        start = time.perf_counter()
+        if self.workers == 1:
+            results = [mcts_search(*jobs[0])]
+        else:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers)
+            results = [future.result() for future in [self.pool.submit(mcts_search, *job) for job in jobs]]
+        self.elapsed = time.perf_counter() - start
+
+        totals = {}
+        self.playouts = 0
+        for children, playouts in results:
+            self.playouts += playouts
+            for cell, (visits, wins) in children.items():
+                total = totals.setdefault(cell, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        if not totals:
+            return 0.5, None
+        cell = max(totals, key=lambda cell: totals[cell][0])
+        visits, wins = totals[cell]
+        return wins / visits, divmod(cell, self.cols)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
 # --- Game Loop ---
 
-def play_game(strategy="dfs"):
-    board = [[EMPTY] * 3 for _ in range(3)]
+def play_game(strategy="dfs", rows=3, cols=3, k=3, budget=0.2, iterations=None, workers=None):
+    if (rows, cols, k) != (3, 3, 3) and strategy not in ("mnk", "mcts"):
+        print(f"{strategy} only plays 3x3; using the m,n,k engine.")
+        strategy = "mnk"
+    engine = AlphaBeta()  # one table for the whole game
+    mnk = MNKEngine(rows, cols, k, budget)
+    mcts = MCTSPlayer(rows, cols, k, budget, iterations, workers)  # starts its pool on first use
+    masks, full = line_masks(rows, cols, k), (1 << rows * cols) - 1
+    x = o = 0  # bitboards; the engines still get list-of-lists boards via to_board
     print("Welcome to Tic-Tac-Toe!")
-    print_board(board)
+    print_board(to_board(x, o, rows, cols))
 
     while True:
         # Player move
         row, col = map(int, input("Enter your move (row col): ").split())
-        if board[row][col] != EMPTY:
+        if not 0 <= row < rows or not 0 <= col < cols or (x | o) >> (row * cols + col) & 1:
             print("Invalid move. Try again.")
             continue
-        board[row][col] = PLAYER
-        print_board(board)
+        bit = 1 << (row * cols + col)
+        x |= bit
+        print_board(to_board(x, o, rows, cols))
 
-        if check_winner(board) == PLAYER:
+        if has_won(x, masks):
             print("You win!")
             break
-        elif is_full(board):
+        elif x | o == full:
             print("Draw!")
             break
 
         # AI move
         print(f"AI is thinking using {strategy.upper()}...")
         if strategy == "dfs":
-            _, move = dfs(board, AI)
+            _, bit = minimax_bits(x, o, True)
+            move = bit and bit_move(bit)
+        elif strategy == "alphabeta":
+            _, move = engine.best_move(to_board(x, o), AI)
+        elif strategy == "mnk":
+            _, move = mnk.best_move(to_board(x, o, rows, cols), AI)
+            print(f"depth {mnk.depth}, {mnk.nodes} nodes in {1000 * mnk.elapsed:.0f}ms "
+                  f"({mnk.nodes / max(mnk.elapsed, 1e-9):.0f} nodes/s)")
+        elif strategy == "mcts":
+            _, move = mcts.best_move(to_board(x, o, rows, cols), AI)
+            print(f"{mcts.playouts} playouts on {mcts.workers} workers in {1000 * mcts.elapsed:.0f}ms "
+                  f"({mcts.playouts / max(mcts.elapsed, 1e-9):.0f} playouts/s)")
         else:
-            _, move = a_star(board)
+            _, move = a_star(to_board(x, o))
 
         if move:
-            board[move[0]][move[1]] = AI
-            print_board(board)
+            o |= 1 << (move[0] * cols + move[1])
+            print_board(to_board(x, o, rows, cols))
         else:
             print("Draw!")
             break
 
-        if check_winner(board) == AI:
+        if has_won(o, masks):
             print("AI wins!")
             break
-        elif is_full(board):
+        elif x | o == full:
             print("Draw!")
             break
 
+    mcts.close()
+
+def random_positions(count, seed=0):
+    # Random legal positions reached by alternating moves, stopping at a win.
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        x = o = 0
+        for turn in range(rng.randint(0, 9)):
+            free = [i for i in range(9) if not (x | o) >> i & 1]
+            bit = 1 << rng.choice(free)
+            if turn % 2:
+                o |= bit
+            else:
+                x |= bit
+            if has_won(x) or has_won(o):
+                break
+        positions.append((x, o))
+    return positions
+
+def evaluations_per_second(evaluate_one, positions, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for position in positions:
+            evaluate_one(position)
+    return repeats * len(positions) / (time.perf_counter() - start)
+
+def benchmark(budget=0.2):
+    # Win-check throughput of the old list code against the bitboard core.
+    positions = random_positions(10000)
+    boards = [to_board(x, o) for x, o in positions]
+    list_rate = evaluations_per_second(check_winner_reference, boards)
+    bits_rate = evaluations_per_second(lambda position: evaluate(*position), positions)
+    print(f"win check: list {list_rate / 1e6:.2f}M evals/s, bitboard {bits_rate / 1e6:.2f}M evals/s "
+          f"({bits_rate / list_rate:.1f}x)")
+
+    # Nodes and time for the AI's reply to each opening, and for the empty board.
+    openings = [None, (1, 1), (0, 0), (0, 1)]
+    for opening in openings:
+        board = [[EMPTY] * 3 for _ in range(3)]
+        if opening:
+            board[opening[0]][opening[1]] = PLAYER
+        stats = {}
+        start = time.perf_counter()
+        dfs(board, AI, stats)
+        dfs_time = time.perf_counter() - start
+        engine = AlphaBeta()
+        start = time.perf_counter()
+        engine.best_move(board, AI)
+        ab_time = time.perf_counter() - start
+        print(f"opening {opening}: dfs {stats['nodes']} nodes {1000 * dfs_time:.1f}ms "
+              f"({stats['nodes'] / dfs_time / 1e6:.2f}M nodes/s), "
+              f"alphabeta {engine.nodes} nodes {1000 * ab_time:.2f}ms")
+
+    # Depth the m,n,k engine reaches for the first reply within its budget.
+    for rows, cols, k in [(3, 3, 3), (4, 4, 4), (7, 7, 4), (15, 15, 5)]:
+        board = [[EMPTY] * cols for _ in range(rows)]
+        board[rows // 2][cols // 2] = PLAYER
+        mnk = MNKEngine(rows, cols, k, budget)
+        mnk.best_move(board, AI)
+        print(f"{rows}x{cols} k={k}: depth {mnk.depth}, {mnk.nodes} nodes in {1000 * mnk.elapsed:.0f}ms "
+              f"({mnk.nodes / mnk.elapsed:.0f} nodes/s)")
+
+    # MCTS playouts/s on 7x7 k=4 as workers double up to the core count.
+    board = [[EMPTY] * 7 for _ in range(7)]
+    board[3][3] = PLAYER
+    workers = 1
+    while True:
+        mcts = MCTSPlayer(7, 7, 4, budget, workers=workers, seed=0)
+        mcts.best_move(board, AI)  # starts the pool
+        mcts.best_move(board, AI)
+        mcts.close()
+        print(f"mcts 7x7 k=4, {workers} workers: {mcts.playouts / mcts.elapsed:.0f} playouts/s")
+        if workers >= (os.cpu_count() or 1):
+            break
+        workers = min(2 * workers, os.cpu_count())
+
 # Example usage
 if __name__ == "__main__":
-    mode = input("Choose strategy for AI (dfs/a*): ").strip().lower()
-    play_game(strategy=mode)
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe against the computer, on 3x3 or any m,n,k board.")
+    parser.add_argument("--size", type=int, nargs=3, default=[3, 3, 3], metavar=("ROWS", "COLS", "K"),
+                        help="board size and line length needed to win")
+    parser.add_argument("--budget", type=float, default=0.2, help="seconds per move for the mnk and mcts players")
+    parser.add_argument("--iterations", type=int, help="playouts per move for mcts, instead of the time budget")
+    parser.add_argument("--workers", type=int, help="worker processes for mcts (default: all cores)")
+    parser.add_argument("--bench", action="store_true")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.budget)
+        sys.exit()
+    mode = input("Choose strategy for AI (dfs/a*/alphabeta/mnk/mcts): ").strip().lower()
+    play_game(mode, *args.size, args.budget, args.iterations, args.workers)